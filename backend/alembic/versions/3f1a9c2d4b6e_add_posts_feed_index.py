@@ -0,0 +1,30 @@
+"""Add composite index for the keyset post feed
+
+Revision ID: 3f1a9c2d4b6e
+Revises: 7ebf6963643c
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d4b6e'
+down_revision: Union[str, None] = '7ebf6963643c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_posts_feed',
+        'posts',
+        ['is_active', sa.text('created_at DESC'), sa.text('id DESC')],
+        schema='boom_blog'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_feed', table_name='posts', schema='boom_blog')
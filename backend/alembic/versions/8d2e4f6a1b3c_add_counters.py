@@ -0,0 +1,51 @@
+"""Add maintained counters and posts.comment_count
+
+Revision ID: 8d2e4f6a1b3c
+Revises: 3f1a9c2d4b6e
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4f6a1b3c'
+down_revision: Union[str, None] = '3f1a9c2d4b6e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'counters',
+        sa.Column('name', sa.String(), primary_key=True),
+        sa.Column('value', sa.BigInteger(), nullable=False, server_default='0'),
+        schema='boom_blog'
+    )
+    op.add_column(
+        'posts',
+        sa.Column('comment_count', sa.Integer(), nullable=True, server_default='0'),
+        schema='boom_blog'
+    )
+
+    # Seed from the current data
+    op.execute("""
+        INSERT INTO boom_blog.counters (name, value) VALUES
+            ('users', (SELECT count(*) FROM boom_blog.users)),
+            ('posts', (SELECT count(*) FROM boom_blog.posts)),
+            ('posts_active', (SELECT count(*) FROM boom_blog.posts WHERE is_active)),
+            ('comments', (SELECT count(*) FROM boom_blog.comments))
+    """)
+    op.execute("""
+        UPDATE boom_blog.posts p SET comment_count = (
+            SELECT count(*) FROM boom_blog.comments c
+            WHERE c.post_id = p.id AND c.is_approved
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'comment_count', schema='boom_blog')
+    op.drop_table('counters', schema='boom_blog')
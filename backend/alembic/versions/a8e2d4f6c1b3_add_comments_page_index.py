@@ -0,0 +1,30 @@
+"""Add (post_id, is_approved, created_at, id) index for comment pages
+
+Revision ID: a8e2d4f6c1b3
+Revises: f1c3a5e7b9d2
+Create Date: 2026-10-18 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8e2d4f6c1b3'
+down_revision: Union[str, None] = 'f1c3a5e7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_comments_post_page',
+        'comments',
+        ['post_id', 'is_approved', 'created_at', 'id'],
+        schema='boom_blog'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_post_page', table_name='comments', schema='boom_blog')
@@ -0,0 +1,57 @@
+"""Add comment threading columns and reply counts
+
+Revision ID: b3d7f9a1c5e2
+Revises: a8e2d4f6c1b3
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d7f9a1c5e2'
+down_revision: Union[str, None] = 'a8e2d4f6c1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('comments', sa.Column('parent_id', sa.Integer(), nullable=True), schema='boom_blog')
+    op.add_column('comments', sa.Column('root_id', sa.Integer(), nullable=True), schema='boom_blog')
+    op.add_column('comments', sa.Column('depth', sa.Integer(), nullable=False, server_default='0'), schema='boom_blog')
+    op.add_column('comments', sa.Column('path', sa.String(), nullable=True), schema='boom_blog')
+    op.add_column('comments', sa.Column('reply_count', sa.Integer(), nullable=False, server_default='0'), schema='boom_blog')
+    for column in ('parent_id', 'root_id'):
+        op.create_foreign_key(
+            f'comments_{column}_fkey', 'comments', 'comments', [column], ['id'],
+            source_schema='boom_blog', referent_schema='boom_blog', ondelete='CASCADE'
+        )
+    # Existing comments are all top-level
+    op.execute("UPDATE boom_blog.comments SET path = lpad(id::text, 10, '0')")
+    op.create_index('ix_comments_root_path', 'comments', ['root_id', 'path'], schema='boom_blog')
+    # Top-level pages only ever read parent_id IS NULL rows
+    op.drop_index('ix_comments_post_page', table_name='comments', schema='boom_blog')
+    op.create_index(
+        'ix_comments_post_page',
+        'comments',
+        ['post_id', 'is_approved', 'created_at', 'id'],
+        schema='boom_blog',
+        postgresql_where=sa.text('parent_id IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_post_page', table_name='comments', schema='boom_blog')
+    op.create_index(
+        'ix_comments_post_page',
+        'comments',
+        ['post_id', 'is_approved', 'created_at', 'id'],
+        schema='boom_blog'
+    )
+    op.drop_index('ix_comments_root_path', table_name='comments', schema='boom_blog')
+    for column in ('root_id', 'parent_id'):
+        op.drop_constraint(f'comments_{column}_fkey', 'comments', schema='boom_blog', type_='foreignkey')
+    for column in ('reply_count', 'path', 'depth', 'root_id', 'parent_id'):
+        op.drop_column('comments', column, schema='boom_blog')
@@ -0,0 +1,26 @@
+"""Add posts.image_status for background image uploads
+
+Revision ID: b7c4e1d9a2f5
+Revises: 8d2e4f6a1b3c
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c4e1d9a2f5'
+down_revision: Union[str, None] = '8d2e4f6a1b3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('image_status', sa.String(), nullable=True), schema='boom_blog')
+    op.execute("UPDATE boom_blog.posts SET image_status = 'ready' WHERE image_url IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'image_status', schema='boom_blog')
@@ -0,0 +1,26 @@
+"""Add posts.image_renditions
+
+Revision ID: c5a8d3f7e214
+Revises: b7c4e1d9a2f5
+Create Date: 2026-10-18 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8d3f7e214'
+down_revision: Union[str, None] = 'b7c4e1d9a2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing posts keep serving their original image until re-uploaded
+    op.add_column('posts', sa.Column('image_renditions', sa.JSON(), nullable=True), schema='boom_blog')
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'image_renditions', schema='boom_blog')
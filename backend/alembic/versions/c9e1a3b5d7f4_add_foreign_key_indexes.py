@@ -0,0 +1,38 @@
+"""Index foreign key columns that hot queries and deletes filter on
+
+Revision ID: c9e1a3b5d7f4
+Revises: b3d7f9a1c5e2
+Create Date: 2026-10-18 19:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e1a3b5d7f4'
+down_revision: Union[str, None] = 'b3d7f9a1c5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns that CRUD statements or foreign key checks filter on with no index
+# leading on them; `python -m benchmarks.explain` reports any new ones.
+INDEXES = (
+    ('ix_posts_author_id', 'posts', ['author_id']),
+    ('ix_comments_post_id', 'comments', ['post_id']),
+    ('ix_comments_parent_id', 'comments', ['parent_id']),
+    ('ix_comments_user_id', 'comments', ['user_id']),
+    ('ix_likes_post_id', 'likes', ['post_id']),
+    ('ix_views_post_id', 'views', ['post_id']),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, schema='boom_blog')
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, schema='boom_blog')
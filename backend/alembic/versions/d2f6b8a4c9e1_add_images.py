@@ -0,0 +1,39 @@
+"""Add content-addressed images table and posts.image_hash
+
+Revision ID: d2f6b8a4c9e1
+Revises: c5a8d3f7e214
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6b8a4c9e1'
+down_revision: Union[str, None] = 'c5a8d3f7e214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'images',
+        sa.Column('sha256', sa.String(64), primary_key=True),
+        sa.Column('url', sa.String(), nullable=False),
+        sa.Column('renditions', sa.JSON(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        schema='boom_blog'
+    )
+    # Images uploaded before this revision have no hash and are never collected
+    op.add_column('posts', sa.Column('image_hash', sa.String(64), nullable=True), schema='boom_blog')
+    op.create_index('ix_posts_image_hash', 'posts', ['image_hash'], schema='boom_blog')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_image_hash', table_name='posts', schema='boom_blog')
+    op.drop_column('posts', 'image_hash', schema='boom_blog')
+    op.drop_table('images', schema='boom_blog')
@@ -0,0 +1,47 @@
+"""Add full-text search vector, GIN index and trigger on posts
+
+Revision ID: e4b9c7a1f3d8
+Revises: d2f6b8a4c9e1
+Create Date: 2026-10-18 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c7a1f3d8'
+down_revision: Union[str, None] = 'd2f6b8a4c9e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True), schema='boom_blog')
+    op.execute("""
+        CREATE OR REPLACE FUNCTION boom_blog.posts_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER posts_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, content ON boom_blog.posts
+        FOR EACH ROW EXECUTE FUNCTION boom_blog.posts_search_vector_update()
+    """)
+    # Backfill through the trigger
+    op.execute("UPDATE boom_blog.posts SET title = title")
+    op.create_index('ix_posts_search', 'posts', ['search_vector'], postgresql_using='gin', schema='boom_blog')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_search', table_name='posts', schema='boom_blog')
+    op.execute("DROP TRIGGER IF EXISTS posts_search_vector_update ON boom_blog.posts")
+    op.execute("DROP FUNCTION IF EXISTS boom_blog.posts_search_vector_update()")
+    op.drop_column('posts', 'search_vector', schema='boom_blog')
@@ -0,0 +1,39 @@
+"""Add post_scores for the trending feed
+
+Revision ID: f1c3a5e7b9d2
+Revises: e4b9c7a1f3d8
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3a5e7b9d2'
+down_revision: Union[str, None] = 'e4b9c7a1f3d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the trending refresh job on its first run
+    op.create_table(
+        'post_scores',
+        sa.Column('post_id', sa.Integer(), sa.ForeignKey('boom_blog.posts.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=True),
+        schema='boom_blog'
+    )
+    op.create_index(
+        'ix_post_scores_rank',
+        'post_scores',
+        [sa.text('score DESC'), sa.text('post_id DESC')],
+        schema='boom_blog'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_scores_rank', table_name='post_scores', schema='boom_blog')
+    op.drop_table('post_scores', schema='boom_blog')
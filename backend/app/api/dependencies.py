@@ -1,27 +1,31 @@
 # depandencies.py
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from typing import Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.db.database import get_db
-from app.models.user import User
+from app.db.database import get_db, get_async_db
+from app.db.routing import mark_write
 from app.crud.user_crud import get_user_by_id
+from app.crud import async_user_crud
+from app.utils.principal_cache import Principal, get_cached_principal, cache_principal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")  
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """
-    Decode JWT token and return the authenticated user.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _user_id_from_token(token: str) -> int:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -29,8 +33,70 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = get_user_by_id(db, int(user_id))
-    if user is None:
-        raise credentials_exception
-    return user
+    return int(user_id)
+
+def _track_write(request: Request, response: Response, user: Principal) -> None:
+    # Writers read from the primary for a while so they see their own changes
+    if request.method not in SAFE_METHODS:
+        mark_write(user.id, response)
+
+def _cached_principal_for(request: Request, user_id: int) -> Optional[Principal]:
+    """
+    The cache is per process, so a block or demotion made on another worker
+    only reaches this one on expiry. Writes and admin requests therefore
+    always re-read the user; only plain reads by regular users use the cache.
+    """
+    if request.method not in SAFE_METHODS:
+        return None
+    principal = get_cached_principal(user_id)
+    if principal is not None and principal.is_admin:
+        return None
+    return principal
+
+def get_current_user(
+    request: Request, response: Response, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Decode JWT token and return the authenticated user's Principal.
+    A fresh cached principal means no database round trip for reads.
+    """
+    user_id = _user_id_from_token(token)
+    principal = _cached_principal_for(request, user_id)
+    if principal is None:
+        user = get_user_by_id(db, user_id)
+        if user is None:
+            raise credentials_exception
+        principal = cache_principal(user)
+    _track_write(request, response, principal)
+    return principal
+
+async def get_current_user_async(
+    request: Request, response: Response, token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """
+    Same as get_current_user, for routes running on the async session.
+    """
+    user_id = _user_id_from_token(token)
+    principal = _cached_principal_for(request, user_id)
+    if principal is None:
+        user = await async_user_crud.get_user_by_id(db, user_id)
+        if user is None:
+            raise credentials_exception
+        principal = cache_principal(user)
+    _track_write(request, response, principal)
+    return principal
+
+async def get_optional_user_async(
+    request: Request,
+    response: Response,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[Principal]:
+    """
+    Like get_current_user_async, but anonymous requests get None instead of a 401.
+    A token that is present but invalid is still rejected.
+    """
+    if token is None:
+        return None
+    return await get_current_user_async(request, response, token, db)
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List
 from pydantic import BaseModel
-from app.db.database import get_db
+from app.db.database import get_db, get_pool_stats
+from app.db.routing import get_read_db
+from app.utils.response_cache import response_cache
+from app.utils.principal_cache import principal_cache
 from app.api.dependencies import get_current_user
 from app.models.user import User
 from app.models.post import Post
@@ -11,7 +14,10 @@ from app.schemas.user_schema import UserResponse
 from app.schemas.post_schema import PostResponse
 from app.schemas.comment_schema import CommentResponse
 from app.crud.post_crud import toggle_post_active
-from app.crud.comment_crud import approve_comment, delete_comment
+from app.crud.admin_crud import toggle_user_status
+from app.crud.comment_crud import approve_comment, delete_comment, toggle_comment_approval
+from app.crud.counter_crud import get_counter, USERS, POSTS, COMMENTS
+from app.utils.serialization import ResponseSerializer
 
 router = APIRouter(tags=["Admin"])
 
@@ -27,31 +33,35 @@ class PaginatedCommentsResponse(BaseModel):
     comments: List[CommentResponse]
     total: int
 
+users_page = ResponseSerializer(PaginatedUsersResponse)
+posts_page = ResponseSerializer(PaginatedPostsResponse)
+comments_page = ResponseSerializer(PaginatedCommentsResponse)
+
 @router.get("/users", response_model=PaginatedUsersResponse)
 def get_all_users(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     if not getattr(user, "is_admin", False):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     users = db.query(User).offset(skip).limit(limit).all()
-    total = db.query(User).count()
-    return {"users": users, "total": total}
+    total = get_counter(db, USERS)
+    return users_page.response({"users": users, "total": total})
 
 @router.get("/posts", response_model=PaginatedPostsResponse)
 def get_all_posts(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     if not getattr(user, "is_admin", False):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
-    posts = db.query(Post).offset(skip).limit(limit).all()  # Show all posts for admins
-    total = db.query(Post).count()
-    return {"posts": posts, "total": total}
+    posts = db.query(Post).options(joinedload(Post.author)).offset(skip).limit(limit).all()  # Show all posts for admins
+    total = get_counter(db, POSTS)
+    return posts_page.response({"posts": posts, "total": total})
 
 @router.put("/users/{user_id}/toggle-active", response_model=UserResponse)
 def toggle_user_active(
@@ -61,15 +71,9 @@ def toggle_user_active(
 ):
     if not getattr(user, "is_admin", False):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
-    db_user = db.query(User).filter(User.id == user_id).first()
-    if not db_user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    if db_user.id == user.id:
+    if user_id == user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot toggle own active status")
-    db_user.is_active = not db_user.is_active
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return toggle_user_status(db, user_id)
 
 @router.put("/posts/{post_id}/toggle-active", response_model=PostResponse)
 def toggle_post_active_route(
@@ -85,14 +89,14 @@ def toggle_post_active_route(
 def get_all_comments(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user)
 ):
     if not getattr(user, "is_admin", False):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
-    comments = db.query(Comment).offset(skip).limit(limit).all()
-    total = db.query(Comment).count()
-    return {"comments": comments, "total": total}
+    comments = db.query(Comment).options(joinedload(Comment.user)).offset(skip).limit(limit).all()
+    total = get_counter(db, COMMENTS)
+    return comments_page.response({"comments": comments, "total": total})
 
 @router.put("/comments/{comment_id}/toggle-approve", response_model=CommentResponse)
 def toggle_comment_approve(
@@ -105,10 +109,7 @@ def toggle_comment_approve(
     db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
     if not db_comment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
-    db_comment.is_approved = not db_comment.is_approved
-    db.commit()
-    db.refresh(db_comment)
-    return db_comment
+    return toggle_comment_approval(db, db_comment)
 
 @router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_comment_admin(
@@ -121,5 +122,16 @@ def delete_comment_admin(
     db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
     if not db_comment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
-    db.delete(db_comment)
-    db.commit()
\ No newline at end of file
+    delete_comment(db, db_comment)
+
+@router.get("/db/pool")
+def get_db_pool_stats(user=Depends(get_current_user)):
+    if not getattr(user, "is_admin", False):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return get_pool_stats()
+
+@router.get("/cache")
+def get_cache_stats(user=Depends(get_current_user)):
+    if not getattr(user, "is_admin", False):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return {"responses": response_cache.stats(), "principals": principal_cache.stats()}
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status,Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 import logging
 from jose import  JWTError
 from app.schemas.auth_schema import LoginRequest, AuthResponse
-from app.crud.user_crud import get_user_by_email, create_user
-from app.utils.security import verify_password, create_access_token,decode_token,oauth2_refresh_scheme,create_refresh_token
-from app.db.database import get_db
+from app.crud import async_user_crud
+from app.utils.security import create_access_token,decode_token,oauth2_refresh_scheme,create_refresh_token
+from app.utils.password_hasher import password_hasher
+from app.db.database import get_async_db
 from app.core.config import settings
 from app.schemas.user_schema import UserCreate
 
@@ -14,13 +15,13 @@ router = APIRouter(prefix="", tags=["Authentication"])
 
 
 @router.post("/login_or_register", response_model=AuthResponse)
-def login_or_register(
+async def login_or_register(
     request: LoginRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        user = get_user_by_email(db, request.email)
+        user = await async_user_crud.get_user_by_email(db, request.email)
 
         if user:
             if not user.is_active:
@@ -28,13 +29,20 @@ def login_or_register(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="User account is blocked"
                 )
-            if not verify_password(request.password, user.hashed_password):
+            valid, new_hash = await password_hasher.verify_and_update(request.password, user.hashed_password)
+            if not valid:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid password"
                 )
+            if new_hash:
+                # Hash predates the current BCRYPT_ROUNDS; upgrade it in place
+                await async_user_crud.set_password_hash(db, user, new_hash)
         else:
-            user = create_user(db, UserCreate(email=request.email, password=request.password))
+            hashed_password = await password_hasher.hash(request.password)
+            user = await async_user_crud.create_user(
+                db, UserCreate(email=request.email, password=request.password), hashed_password
+            )
 
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -1,18 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from pydantic import BaseModel
 from app.schemas.comment_schema import CommentCreate, CommentUpdate, CommentResponse
-from app.crud.comment_crud import create_comment, get_comments_by_post, update_comment, delete_comment, approve_comment
+from app.crud.comment_crud import create_comment, update_comment, delete_comment, approve_comment
+from app.crud.async_comment_crud import get_comments_by_post, get_thread
+from app.core.config import settings
 from app.db.database import get_db
-from app.api.dependencies import get_current_user
+from app.db.routing import get_read_async_db
+from app.api.dependencies import get_current_user, get_optional_user_async
 from app.models.comment import Comment
+from app.utils.principal_cache import Principal
+from app.utils.response_cache import response_cache, comments_key
+from app.utils.serialization import ResponseSerializer, json_response
 
 router = APIRouter()
 
 class PaginatedCommentsResponse(BaseModel):
     comments: List[CommentResponse]
     total: int
+    next_cursor: Optional[str] = None
+
+comments_page = ResponseSerializer(PaginatedCommentsResponse)
 
 @router.post("/{post_id}", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 def add_comment(
@@ -24,15 +34,34 @@ def add_comment(
     return create_comment(db, comment, user_id=user.id, post_id=post_id)
 
 @router.get("/{post_id}", response_model=PaginatedCommentsResponse)
-def list_comments(
+async def list_comments(
     post_id: int,
-    skip: int = 0,
-    limit: int = 5,
-    db: Session = Depends(get_db)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(5, ge=1, le=100),
+    cursor: Optional[str] = None,
+    replies: int = Query(settings.COMMENT_REPLIES_PREVIEW, ge=0, le=50),
+    db: AsyncSession = Depends(get_read_async_db),
+    user: Optional[Principal] = Depends(get_optional_user_async)
 ):
-    comments = get_comments_by_post(db, post_id, skip=skip, limit=limit)
-    total = db.query(Comment).filter(Comment.post_id == post_id, Comment.is_approved == True).count()
-    return {"comments": comments, "total": total}
+    # Only anonymous pages come from the cache: a signed-in author must see
+    # their new comment even if this worker still holds a stale page
+    cache_key = comments_key(post_id, skip, limit, cursor, replies) if user is None else None
+    if cache_key:
+        body = response_cache.get(cache_key)
+        if body is not None:
+            return json_response(body)
+
+    comments, total, next_cursor = await get_comments_by_post(
+        db, post_id, skip=skip, limit=limit, cursor=cursor, replies=replies
+    )
+    body = comments_page.to_json({"comments": comments, "total": total, "next_cursor": next_cursor})
+    if cache_key:
+        response_cache.set(cache_key, body)
+    return json_response(body)
+
+@router.get("/thread/{comment_id}", response_model=CommentResponse)
+async def read_thread(comment_id: int, db: AsyncSession = Depends(get_read_async_db)):
+    return await get_thread(db, comment_id)
 
 @router.put("/{comment_id}", response_model=CommentResponse)
 def edit_comment(
@@ -1,89 +1,186 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel
-from app.schemas.post_schema import PostCreate, PostUpdate, PostResponse
-from app.crud.post_crud import create_post, get_post_by_id, get_all_posts, update_post, delete_post, toggle_like
-from app.db.database import get_db
-from app.api.dependencies import get_current_user
+from app.schemas.post_schema import PostCreate, PostUpdate, PostResponse, PostSearchResult
+from app.crud.post_crud import create_post, update_post, delete_post, search_posts
+from app.crud.async_post_crud import (
+    get_post_by_id, get_all_posts, get_trending_posts, get_active_post, get_image_status, toggle_like
+)
+from app.crud.async_counter_crud import get_counter
+from app.crud.counter_crud import POSTS, ACTIVE_POSTS
+from app.db.database import get_db, get_async_db
+from app.db.routing import get_read_db, get_read_async_db
+from app.api.dependencies import get_current_user, get_current_user_async, get_optional_user_async
 from app.models.post import Post
-from app.models.user import User  
-from app.utils.cloudinary_service import upload_to_cloudinary
+from app.utils.principal_cache import Principal
+from app.utils.image_pipeline import image_uploader, PENDING
+from app.utils.uploads import stream_post_form, POST_FORM_OPENAPI
+from app.utils.response_cache import response_cache, feed_key
+from app.utils.serialization import ResponseSerializer, json_response
 
 router = APIRouter(tags=["Posts"])
 
 class PaginatedPostsResponse(BaseModel):
     posts: List[PostResponse]
     total: int
+    next_cursor: Optional[str] = None
 
-@router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
-def create_new_post(
-    title: str = Form(...),
-    content: str = Form(...),
-    image: UploadFile = File(None),
+class TrendingPostsResponse(BaseModel):
+    posts: List[PostResponse]
+    next_cursor: Optional[str] = None
+
+class PostSearchResponse(BaseModel):
+    results: List[PostSearchResult]
+    next_cursor: Optional[str] = None
+
+posts_page = ResponseSerializer(PaginatedPostsResponse)
+trending_page = ResponseSerializer(TrendingPostsResponse)
+search_page = ResponseSerializer(PostSearchResponse)
+
+@router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED, openapi_extra=POST_FORM_OPENAPI)
+async def create_new_post(
+    request: Request,
     db: Session = Depends(get_db),
     user=Depends(get_current_user)
 ):
     if not user.is_active:
         raise HTTPException(status_code=403, detail="User account is blocked")
-    if len(title) > 80:
-        raise HTTPException(status_code=400, detail="Title must be 80 characters or less")
-    image_url = None
-    if image:
-        image_url = upload_to_cloudinary(image, folder="Boom")
-    post = PostCreate(title=title, content=content, image_url=image_url)
-    return create_post(db, post, author_id=user.id)
+    # Streams the image to the staging dir; it is uploaded in the background
+    # and clients poll /{post_id}/image-status
+    form = await stream_post_form(request)
+    try:
+        title = form.fields.get("title")
+        content = form.fields.get("content")
+        if not title or not content:
+            raise HTTPException(status_code=422, detail="Title and content are required")
+        if len(title) > 80:
+            raise HTTPException(status_code=400, detail="Title must be 80 characters or less")
+        post = PostCreate(title=title, content=content, image_status=PENDING if form.image_path else None)
+        db_post = await run_in_threadpool(create_post, db, post, user.id)
+        if form.image_path:
+            # On failure attach marks the post's image "failed" itself
+            db_post = await run_in_threadpool(image_uploader.attach, db, db_post, form.image_path, form.image_sha256)
+    except Exception:
+        form.discard()
+        raise
+    return db_post
 
 @router.get("/", response_model=PaginatedPostsResponse)
-def read_all_posts(
-    skip: int = 0,
-    limit: int = 6,
-    db: Session = Depends(get_db),
-    user: Optional[User] = Depends(get_current_user, use_cache=False)  
+async def read_all_posts(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(6, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_async_db),
+    user: Optional[Principal] = Depends(get_optional_user_async)
 ):
+    # Anonymous pages are identical for everyone: serve them from the cache
+    cache_key = feed_key(skip, limit, cursor) if user is None else None
+    if cache_key:
+        body = response_cache.get(cache_key)
+        if body is not None:
+            return json_response(body)
+
     is_admin = user.is_admin if user else False
-    posts = get_all_posts(db, skip=skip, limit=limit, is_admin=is_admin)
-    if is_admin:
-        print("admin")
-        total = db.query(Post).count()
-    else:
-        total = db.query(Post).filter(Post.is_active == True).count()
-    return {"posts": posts, "total": total}
+    posts, next_cursor = await get_all_posts(
+        db,
+        skip=skip,
+        limit=limit,
+        is_admin=is_admin,
+        cursor=cursor,
+        user_id=user.id if user else None,
+    )
+    total = await get_counter(db, POSTS if is_admin else ACTIVE_POSTS)
+    body = posts_page.to_json({"posts": posts, "total": total, "next_cursor": next_cursor})
+    if cache_key:
+        response_cache.set(cache_key, body)
+    return json_response(body)
+
+# /trending and /search must stay above /{post_id}, which would otherwise capture them
+@router.get("/trending", response_model=TrendingPostsResponse)
+async def read_trending_posts(
+    limit: int = Query(6, ge=1, le=50),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_async_db),
+    user: Optional[Principal] = Depends(get_optional_user_async)
+):
+    # Scores come from post_scores, refreshed every TRENDING_REFRESH_SECONDS
+    posts, next_cursor = await get_trending_posts(
+        db, limit=limit, cursor=cursor, user_id=user.id if user else None
+    )
+    return trending_page.response({"posts": posts, "next_cursor": next_cursor})
+
+@router.get("/search", response_model=PostSearchResponse)
+def search(
+    q: str = Query(..., max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    if not q.strip():
+        return {"results": [], "next_cursor": None}
+    posts, next_cursor = search_posts(db, q.strip(), limit=limit, cursor=cursor)
+    return search_page.response({"results": posts, "next_cursor": next_cursor})
 
 @router.get("/{post_id}", response_model=PostResponse)
-def read_post(
+async def read_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    user: Optional[User] = Depends(get_current_user, use_cache=False)  
+    db: AsyncSession = Depends(get_read_async_db),
+    user: Optional[Principal] = Depends(get_optional_user_async)
 ):
-    db_post = get_post_by_id(db, post_id, user_id=user.id if user else None)
+    db_post = await get_post_by_id(db, post_id, user_id=user.id if user else None)
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found or inactive")
     return db_post
 
-@router.put("/{post_id}", response_model=PostResponse)
-def update_existing_post(
+@router.get("/{post_id}/image-status")
+async def read_image_status(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Polled right after a write, so read the primary and skip the caches
+    row = await get_image_status(db, post_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Post not found or inactive")
+    return {"post_id": post_id, "image_status": row.image_status, "image_url": row.image_url}
+
+@router.put("/{post_id}", response_model=PostResponse, openapi_extra=POST_FORM_OPENAPI)
+async def update_existing_post(
     post_id: int,
-    title: Optional[str] = Form(None),
-    content: Optional[str] = Form(None),
-    image: UploadFile = File(None),
+    request: Request,
     db: Session = Depends(get_db),
     user=Depends(get_current_user)
 ):
     if not user.is_active:
         raise HTTPException(status_code=403, detail="User account is blocked")
-    db_post = db.query(Post).filter(Post.id == post_id, Post.is_active == True).first()
+    # Authorize before reading the body, so a refused upload is never streamed
+    db_post = await run_in_threadpool(
+        lambda: db.query(Post).filter(Post.id == post_id, Post.is_active == True).first()
+    )
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found or inactive")
     if db_post.author_id != user.id and not user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized to update this post")
-    if title and len(title) > 80:
-        raise HTTPException(status_code=400, detail="Title must be 80 characters or less")
-    image_url = db_post.image_url
-    if image and image.size > 0:
-        image_url = upload_to_cloudinary(image, folder="Boom")
-    updates = PostUpdate(title=title, content=content, image_url=image_url)
-    return update_post(db, db_post, updates)
+    form = await stream_post_form(request)
+    try:
+        title = form.fields.get("title")
+        content = form.fields.get("content")
+        if title and len(title) > 80:
+            raise HTTPException(status_code=400, detail="Title must be 80 characters or less")
+        updates = PostUpdate(title=title, content=content, image_url=db_post.image_url)
+        if form.image_path:
+            # Keeps showing the current image until the new one is uploaded
+            updates.image_status = PENDING
+        db_post = await run_in_threadpool(update_post, db, db_post, updates)
+        if form.image_path:
+            # On failure attach marks the post's image "failed" itself
+            db_post = await run_in_threadpool(image_uploader.attach, db, db_post, form.image_path, form.image_sha256)
+    except Exception:
+        form.discard()
+        raise
+    return db_post
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_existing_post(
@@ -102,15 +199,15 @@ def delete_existing_post(
     return None
 
 @router.post("/{post_id}/like")
-def like_or_unlike(
+async def like_or_unlike(
     post_id: int,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async)
 ):
     if not user.is_active:
         raise HTTPException(status_code=403, detail="User account is blocked")
-    db_post = db.query(Post).filter(Post.id == post_id, Post.is_active == True).first()
+    db_post = await get_active_post(db, post_id)
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found or inactive")
-    updated_like_count, is_liked = toggle_like(db, post_id, user.id)
+    updated_like_count, is_liked = await toggle_like(db, post_id, user.id)
     return {"like_count": updated_like_count, "is_liked": is_liked}
\ No newline at end of file
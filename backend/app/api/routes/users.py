@@ -2,10 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
+from app.db.routing import get_read_db
 from app.schemas.user_schema import UserResponse, UserUpdate
 from app.crud.user_crud import get_all_users, get_user_by_id, update_user, delete_user
 from app.api.dependencies import get_current_user
-from app.models.user import User
+from app.utils.principal_cache import Principal
 
 router = APIRouter(tags=["Users"])
 
@@ -13,8 +14,8 @@ router = APIRouter(tags=["Users"])
 def read_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     if not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
@@ -23,8 +24,8 @@ def read_users(
 @router.get("/{user_id}", response_model=UserResponse)
 def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     user = get_user_by_id(db, user_id)
     if not user:
@@ -38,7 +39,7 @@ def update_existing_user(
     user_id: int,
     updates: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     user = get_user_by_id(db, user_id)
     if not user:
@@ -51,7 +52,7 @@ def update_existing_user(
 def delete_existing_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     if not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
@@ -1,5 +1,6 @@
 
 import os
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
@@ -10,15 +11,56 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Boom-Blog" 
     ENVIRONMENT: str = "development"
     DATABASE_URL: str  
+    DATABASE_REPLICA_URLS: str = ""  # comma-separated read replicas; empty = read from primary
+    READ_YOUR_WRITES_SECONDS: int = 10  # route a user's reads to the primary this long after they write
     DB_SCHEMA: str = "boom_blog"  
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; recycle before server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True  # detect connections dropped by a Postgres restart
+    DB_STATEMENT_TIMEOUT_MS: int = 15000  # 0 disables
+    DB_CREATE_ALL: bool = False  # create missing tables at startup (dev only; production runs alembic upgrade head)
+    VIEW_FLUSH_INTERVAL_SECONDS: float = 5.0
+    VIEW_BUFFER_MAX_PENDING: int = 5000  # flush early at this many buffered views; more are dropped until it succeeds
+    RESPONSE_CACHE_MAXSIZE: int = 512  # cached anonymous list pages; 0 disables
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAXSIZE: int = 10000  # authenticated users kept in memory; 0 disables
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0  # bounds how long other workers let a blocked user read; writes always re-check
+    BCRYPT_ROUNDS: int = 12  # changing this rehashes each user's password at their next login
+    PASSWORD_HASH_WORKERS: int = 2  # threads dedicated to bcrypt
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32  # hashes allowed to wait for a worker before logins get 503
+    COMMENT_REPLIES_PREVIEW: int = 3  # replies shown under each top-level comment in a page
+    COMMENT_MAX_DEPTH: int = 8  # replies to a comment this deep become its siblings
+    METRICS_ENABLED: bool = True  # collect request, SQL, pool and upload metrics
+    METRICS_TOKEN: Optional[str] = None  # bearer token for GET /metrics; unset = not served
+    TRENDING_REFRESH_SECONDS: float = 300.0  # 0 disables the in-process refresh loop
+    TRENDING_WINDOW_DAYS: int = 14  # older posts drop out of the trending feed
+    TRENDING_GRAVITY: float = 1.5  # higher = scores decay faster with age
+    TRENDING_BATCH_SIZE: int = 5000  # posts scored per statement
     SECRET_KEY: str     
     ALGORITHM: str = "HS256"  
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  
-    CLOUDINARY_CLOUD_NAME: str  
-    CLOUDINARY_API_KEY: str  
-    CLOUDINARY_API_SECRET: str  
+    # Only needed when STORAGE_BACKEND is "cloudinary"
+    CLOUDINARY_CLOUD_NAME: Optional[str] = None
+    CLOUDINARY_API_KEY: Optional[str] = None
+    CLOUDINARY_API_SECRET: Optional[str] = None
     CLOUDINARY_FOLDER: str = "Boom"  
-    CLOUDINARY_UPLOAD_PRESET: str 
+    CLOUDINARY_UPLOAD_PRESET: Optional[str] = None
+    STORAGE_BACKEND: str = "cloudinary"  # or "local" to keep images on disk (offline/dev)
+    LOCAL_STORAGE_DIR: str = "var/media"
+    LOCAL_STORAGE_URL: str = "/media"  # where LOCAL_STORAGE_DIR is served
+    IMAGE_STAGING_DIR: str = "var/staging"  # uploads wait here for the background worker
+    IMAGE_UPLOAD_WORKERS: int = 2
+    IMAGE_UPLOAD_MAX_ATTEMPTS: int = 4
+    IMAGE_UPLOAD_RETRY_SECONDS: float = 2.0  # first retry delay; doubles on each attempt
+    IMAGE_RENDITIONS_AVIF: bool = False  # also encode AVIF variants (slow to encode)
+    IMAGE_GC_GRACE_SECONDS: int = 86400  # unreferenced images are kept this long before gc_images deletes them
+
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
 
     class Config:
         env_file = ENV_PATH
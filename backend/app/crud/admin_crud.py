@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.post import Post
+from app.crud.counter_crud import increment_counter, ACTIVE_POSTS
+from app.utils.response_cache import invalidate_post
+from app.utils.principal_cache import invalidate_principal
 from fastapi import HTTPException, status
 
 def toggle_user_status(db: Session, user_id: int):
@@ -9,6 +12,7 @@ def toggle_user_status(db: Session, user_id: int):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     user.is_active = not user.is_active
     db.commit()
+    invalidate_principal(user_id)
     db.refresh(user)
     return user
 
@@ -17,6 +21,8 @@ def toggle_post_active(db: Session, post_id: int):
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
     post.is_active = not post.is_active  
+    increment_counter(db, ACTIVE_POSTS, 1 if post.is_active else -1)
     db.commit()
+    invalidate_post(post_id)
     db.refresh(post)
     return post
\ No newline at end of file
@@ -0,0 +1,30 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.models.comment import Comment
+from app.crud.comment_crud import (
+    comments_page_query, split_comments_page, comment_count_query,
+    replies_query, thread_query, nest_replies, build_thread,
+)
+
+# Async counterparts of comment_crud for the async (asyncpg) routes.
+
+async def get_comments_by_post(
+    db: AsyncSession,
+    post_id: int,
+    skip: int = 0,
+    limit: int = 5,
+    cursor: Optional[str] = None,
+    replies: int = settings.COMMENT_REPLIES_PREVIEW,
+) -> Tuple[List[Comment], int, Optional[str]]:
+    rows = (await db.execute(comments_page_query(post_id, skip, limit, cursor))).all()
+    comments, total, next_cursor = split_comments_page(rows, limit)
+    if total is None and (skip or cursor):
+        total = await db.scalar(comment_count_query(post_id)) or 0
+    if comments and replies > 0:
+        result = await db.execute(replies_query([c.id for c in comments], replies))
+        nest_replies(comments, result.scalars().all())
+    return comments, total or 0, next_cursor
+
+async def get_thread(db: AsyncSession, comment_id: int) -> Comment:
+    return build_thread((await db.execute(thread_query(comment_id))).scalars().all())
@@ -0,0 +1,16 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.counter import Counter
+from app.crud.counter_crud import COUNTER_QUERIES, increment_counter_statement
+
+# Async counterparts of counter_crud.
+
+async def get_counter(db: AsyncSession, name: str) -> int:
+    value = await db.scalar(select(Counter.value).where(Counter.name == name))
+    if value is None:
+        value = await db.scalar(COUNTER_QUERIES[name]())
+    return int(value or 0)
+
+async def increment_counter(db: AsyncSession, name: str, delta: int = 1) -> None:
+    if delta:
+        await db.execute(increment_counter_statement(name, delta))
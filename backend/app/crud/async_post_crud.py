@@ -0,0 +1,106 @@
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from app.models.post import Post
+from app.models.like import Like
+from app.crud.post_crud import (
+    feed_page_query,
+    split_feed_page,
+    liked_post_ids_query,
+    viewed_post_ids_query,
+    apply_user_flags,
+    active_post_query,
+    unlike_statement,
+    like_statement,
+    like_count_statement,
+)
+from app.crud.trending_crud import trending_page_query
+from app.utils.pagination import encode_cursor
+from app.utils.view_buffer import view_buffer
+
+# Async counterparts of post_crud for the async (asyncpg) routes. Statements
+# are built by the shared helpers in post_crud so both paths stay identical.
+
+async def get_all_posts(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 6,
+    is_admin: bool = False,
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = None,
+) -> Tuple[List[Post], Optional[str]]:
+    rows = (await db.scalars(feed_page_query(skip, limit, is_admin, cursor))).all()
+    posts, next_cursor = split_feed_page(rows, limit)
+    if user_id and posts:
+        post_ids = [post.id for post in posts]
+        liked = set(await db.scalars(liked_post_ids_query(user_id, post_ids)))
+        viewed = set(await db.scalars(viewed_post_ids_query(user_id, post_ids)))
+        apply_user_flags(posts, user_id, liked, viewed)
+    return posts, next_cursor
+
+async def get_trending_posts(
+    db: AsyncSession,
+    limit: int = 6,
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = None,
+) -> Tuple[List[Post], Optional[str]]:
+    """A page of the trending feed, highest score first, and the cursor for the next page."""
+    rows = (await db.execute(trending_page_query(limit, cursor))).all()
+    posts = [row.Post for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.score, last.Post.id)
+    if user_id and posts:
+        post_ids = [post.id for post in posts]
+        liked = set(await db.scalars(liked_post_ids_query(user_id, post_ids)))
+        viewed = set(await db.scalars(viewed_post_ids_query(user_id, post_ids)))
+        apply_user_flags(posts, user_id, liked, viewed)
+    return posts, next_cursor
+
+async def get_image_status(db: AsyncSession, post_id: int):
+    """(image_status, image_url) of an active post, or None."""
+    return (
+        await db.execute(
+            select(Post.image_status, Post.image_url).where(Post.id == post_id, Post.is_active == True)
+        )
+    ).first()
+
+async def get_active_post(db: AsyncSession, post_id: int) -> Optional[Post]:
+    return (await db.scalars(active_post_query(post_id))).first()
+
+async def get_post_by_id(db: AsyncSession, post_id: int, user_id: int = None):
+    post = await get_active_post(db, post_id)
+    if not post:
+        return None
+
+    is_liked = False
+    is_viewed = False
+
+    if user_id:
+        # Read-only: the view is buffered and written behind by view_buffer
+        view_buffer.record(post_id, user_id)
+        is_viewed = True
+
+        is_liked = await db.scalar(
+            select(exists().where(Like.post_id == post_id, Like.user_id == user_id))
+        )
+
+    post.is_liked = is_liked
+    post.is_viewed = is_viewed
+    return post
+
+async def toggle_like(db: AsyncSession, post_id: int, user_id: int):
+    """Async post_crud.toggle_like: one statement sequence, no read-modify-write."""
+    unliked = (await db.execute(unlike_statement(post_id, user_id))).first() is not None
+    if unliked:
+        delta = -1
+    else:
+        delta = 1 if (await db.execute(like_statement(post_id, user_id))).first() is not None else 0
+    like_count = (await db.execute(like_count_statement(post_id, delta))).scalar()
+    if like_count is None:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    await db.commit()
+    return like_count, not unliked
@@ -0,0 +1,32 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.models.user import User
+from app.schemas.user_schema import UserCreate
+from app.crud.async_counter_crud import increment_counter
+from app.crud.counter_crud import USERS
+
+# Async counterparts of user_crud, used by the async routes.
+
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.get(User, user_id)
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return (await db.scalars(select(User).where(User.email == email))).first()
+
+async def create_user(db: AsyncSession, user: UserCreate, hashed_password: str) -> User:
+    """Hashing is the caller's job so it can run on the password hasher's executor."""
+    db_user = User(
+        username=user.username or user.email,
+        email=user.email,
+        hashed_password=hashed_password,
+    )
+    db.add(db_user)
+    await increment_counter(db, USERS)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def set_password_hash(db: AsyncSession, db_user: User, hashed_password: str) -> None:
+    db_user.hashed_password = hashed_password
+    await db.commit()
@@ -1,9 +1,20 @@
+from collections import defaultdict
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.comment import Comment
 from app.models.post import Post
 from app.schemas.comment_schema import CommentCreate, CommentUpdate
+from app.crud.counter_crud import increment_counter, adjust_comment_count, adjust_reply_count, COMMENTS
+from app.utils.response_cache import invalidate_comments
+from app.utils.pagination import encode_cursor, decode_datetime_cursor
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, delete, func, or_, select, tuple_
 from fastapi import HTTPException
+from typing import Iterable, List, Optional, Tuple
+
+# Width of one id in Comment.path; fixed so paths sort like the tree
+PATH_SEGMENT = "010d"
 
 
 def create_comment(db: Session, comment: CommentCreate, user_id: int, post_id: int):
@@ -11,38 +22,203 @@ def create_comment(db: Session, comment: CommentCreate, user_id: int, post_id: i
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found or inactive")
     db_comment = Comment(content=comment.content, user_id=user_id, post_id=post_id, is_approved=True)
+    prefix = None
+    if comment.parent_id is not None:
+        parent = (
+            db.query(Comment)
+            .filter(Comment.id == comment.parent_id, Comment.post_id == post_id, Comment.is_approved == True)
+            .first()
+        )
+        if not parent:
+            raise HTTPException(status_code=404, detail="Parent comment not found")
+        if parent.depth >= settings.COMMENT_MAX_DEPTH:
+            # Too deep to nest further: reply alongside the parent instead
+            db_comment.parent_id, db_comment.depth = parent.parent_id, parent.depth
+            prefix = parent.path.rpartition("/")[0]
+        else:
+            db_comment.parent_id, db_comment.depth = parent.id, parent.depth + 1
+            prefix = parent.path
+        db_comment.root_id = parent.root_id or parent.id
     db.add(db_comment)
+    db.flush()  # the path ends with the new comment's own id
+    segment = format(db_comment.id, PATH_SEGMENT)
+    db_comment.path = f"{prefix}/{segment}" if prefix else segment
+    increment_counter(db, COMMENTS)
+    _adjust_approved_counts(db, db_comment, 1)
     db.commit()
+    invalidate_comments(post_id)
     db.refresh(db_comment, attribute_names=["user"])
     return db_comment
 
-def get_comments_by_post(db: Session, post_id: int, skip: int = 0, limit: int = 5):
-    db_post = db.query(Post).filter(Post.id == post_id, Post.is_active == True).first()
-    if not db_post:
-        return []
+def get_comments_by_post(
+    db: Session,
+    post_id: int,
+    skip: int = 0,
+    limit: int = 5,
+    cursor: Optional[str] = None,
+    replies: int = settings.COMMENT_REPLIES_PREVIEW,
+) -> Tuple[List[Comment], int, Optional[str]]:
+    """
+    A page of approved top-level comments, oldest first, with the first
+    `replies` replies of each nested under it, plus the number of
+    top-level comments and the next-page cursor. Two statements however
+    deep the threads are: the page (see comments_page_query) and its replies.
+    """
+    rows = db.execute(comments_page_query(post_id, skip, limit, cursor)).all()
+    comments, total, next_cursor = split_comments_page(rows, limit)
+    if total is None and (skip or cursor):
+        # Paged past the end, so no row carried the total
+        total = db.scalar(comment_count_query(post_id)) or 0
+    if comments and replies > 0:
+        nest_replies(comments, db.execute(replies_query([c.id for c in comments], replies)).scalars().all())
+    return comments, total or 0, next_cursor
+
+def get_thread(db: Session, comment_id: int) -> Comment:
+    """The whole thread containing a comment, nested under its root."""
+    return build_thread(db.execute(thread_query(comment_id)).scalars().all())
+
+# Statement builders shared with async_comment_crud
+def comments_page_query(post_id: int, skip: int, limit: int, cursor: Optional[str] = None):
+    """
+    Rows are (Comment, total) for top-level comments; limit + 1 of them so
+    the caller can tell whether a next page exists. The inner join on posts
+    yields nothing for a missing or inactive post, so no separate existence
+    check is needed. Offset pages get the total from count(*) OVER (). Keyset
+    pages by (created_at, id) would only count rows past the cursor, so they
+    count the thread in a scalar subquery of the same statement instead.
+    """
+    total = comment_count_query(post_id).scalar_subquery() if cursor else func.count().over()
+    query = (
+        select(Comment, total.label("total"))
+        .join(Post, and_(Post.id == Comment.post_id, Post.is_active == True))
+        .where(Comment.post_id == post_id, Comment.is_approved == True, Comment.parent_id.is_(None))
+        .options(joinedload(Comment.user))
+        .order_by(Comment.created_at.asc(), Comment.id.asc())
+    )
+    if cursor:
+        created_at, comment_id = decode_datetime_cursor(cursor)
+        query = query.where(tuple_(Comment.created_at, Comment.id) > tuple_(created_at, comment_id))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+def split_comments_page(rows, limit: int) -> Tuple[List[Comment], Optional[int], Optional[str]]:
+    comments = [row.Comment for row in rows[:limit]]
+    total = rows[0].total if rows else None
+    next_cursor = None
+    if len(rows) > limit and comments:
+        next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+    return comments, total, next_cursor
+
+def comment_count_query(post_id: int):
+    return (
+        select(func.count())
+        .select_from(Comment)
+        .join(Post, and_(Post.id == Comment.post_id, Post.is_active == True))
+        .where(Comment.post_id == post_id, Comment.is_approved == True, Comment.parent_id.is_(None))
+    )
+
+def replies_query(root_ids: List[int], per_root: int):
+    """
+    The first `per_root` approved replies of each root, depth-first, in one
+    statement: row_number() over each thread's path walks ix_comments_root_path.
+    """
+    ranked = (
+        select(
+            Comment.id,
+            func.row_number().over(partition_by=Comment.root_id, order_by=Comment.path).label("position"),
+        )
+        .where(Comment.root_id.in_(root_ids), Comment.is_approved == True)
+        .subquery()
+    )
+    return (
+        select(Comment)
+        .join(ranked, ranked.c.id == Comment.id)
+        .where(ranked.c.position <= per_root)
+        .options(joinedload(Comment.user))
+        .order_by(Comment.root_id, Comment.path)
+    )
+
+def thread_query(comment_id: int):
+    """Every approved comment in the thread containing `comment_id`, root first."""
+    root_id = select(func.coalesce(Comment.root_id, Comment.id)).where(Comment.id == comment_id).scalar_subquery()
     return (
-        db.query(Comment)
-        .filter(Comment.post_id == post_id, Comment.is_approved == True)
+        select(Comment)
+        .join(Post, and_(Post.id == Comment.post_id, Post.is_active == True))
+        .where(or_(Comment.id == root_id, Comment.root_id == root_id), Comment.is_approved == True)
         .options(joinedload(Comment.user))
-        .order_by(Comment.created_at.asc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+        .order_by(Comment.path)
     )
 
+def nest_replies(roots: List[Comment], replies: Iterable[Comment]) -> List[Comment]:
+    """
+    Hang replies (ordered by path, so parents come first) off their parents
+    in a single pass. Replies whose parent is hidden or was cut off are dropped.
+    """
+    nodes = {c.id: c for c in roots}
+    children = defaultdict(list)
+    for reply in replies:
+        if reply.parent_id in nodes:
+            nodes[reply.id] = reply
+            children[reply.parent_id].append(reply)
+    for parent_id, kids in children.items():
+        # Sets the collection without marking it changed or lazy-loading it
+        set_committed_value(nodes[parent_id], "replies", kids)
+    return roots
+
+def build_thread(rows: List[Comment]) -> Comment:
+    if not rows or rows[0].parent_id is not None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    return nest_replies(rows[:1], rows[1:])[0]
+
+def _adjust_approved_counts(db: Session, db_comment: Comment, delta: int) -> None:
+    adjust_comment_count(db, db_comment.post_id, delta)
+    adjust_reply_count(db, db_comment.root_id, delta)
+
 def update_comment(db: Session, db_comment: Comment, updates: CommentUpdate):
     db_comment.content = updates.content or db_comment.content
+    if not db_comment.is_approved:
+        _adjust_approved_counts(db, db_comment, 1)
     db_comment.is_approved = True
     db.commit()
+    invalidate_comments(db_comment.post_id)
     db.refresh(db_comment, attribute_names=["user"])
     return db_comment
 
 def delete_comment(db: Session, db_comment: Comment):
-    db.delete(db_comment)
+    """Delete a comment and every reply under it in one statement."""
+    post_id = db_comment.post_id
+    subtree = Comment.id == db_comment.id
+    if db_comment.path:
+        thread_root = db_comment.root_id or db_comment.id
+        subtree = or_(
+            subtree,
+            and_(Comment.root_id == thread_root, Comment.path.startswith(db_comment.path + "/", autoescape=True)),
+        )
+    removed = db.execute(
+        delete(Comment).where(subtree).returning(Comment.is_approved).execution_options(synchronize_session=False)
+    ).scalars().all()
+    approved = sum(1 for is_approved in removed if is_approved)
+    increment_counter(db, COMMENTS, -len(removed))
+    adjust_comment_count(db, post_id, -approved)
+    if db_comment.root_id is not None:
+        adjust_reply_count(db, db_comment.root_id, -approved)
     db.commit()
+    invalidate_comments(post_id)
 
 def approve_comment(db: Session, db_comment: Comment):
+    if not db_comment.is_approved:
+        _adjust_approved_counts(db, db_comment, 1)
     db_comment.is_approved = True
     db.commit()
+    invalidate_comments(db_comment.post_id)
+    db.refresh(db_comment, attribute_names=["user"])
+    return db_comment
+
+def toggle_comment_approval(db: Session, db_comment: Comment):
+    db_comment.is_approved = not db_comment.is_approved
+    _adjust_approved_counts(db, db_comment, 1 if db_comment.is_approved else -1)
+    db.commit()
+    invalidate_comments(db_comment.post_id)
     db.refresh(db_comment, attribute_names=["user"])
     return db_comment
\ No newline at end of file
@@ -0,0 +1,115 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, select, update, delete
+from app.models.counter import Counter
+from app.models.user import User
+from app.models.post import Post
+from app.models.comment import Comment
+
+# Counter names
+USERS = "users"
+POSTS = "posts"
+ACTIVE_POSTS = "posts_active"
+COMMENTS = "comments"
+
+# Source-of-truth queries, used to rebuild the counters and as a fallback
+# when a counter row has not been seeded yet.
+COUNTER_QUERIES = {
+    USERS: lambda: select(func.count()).select_from(User),
+    POSTS: lambda: select(func.count()).select_from(Post),
+    ACTIVE_POSTS: lambda: select(func.count()).select_from(Post).where(Post.is_active == True),
+    COMMENTS: lambda: select(func.count()).select_from(Comment),
+}
+
+
+def get_counter(db: Session, name: str) -> int:
+    """Read a maintained counter; falls back to a live COUNT if it was never seeded."""
+    value = db.execute(select(Counter.value).where(Counter.name == name)).scalar()
+    if value is None:
+        value = db.execute(COUNTER_QUERIES[name]()).scalar()
+    return int(value or 0)
+
+
+def seed_counters(db: Session) -> List[str]:
+    """
+    Insert any counter row that is missing, at its live COUNT. Increments
+    only UPDATE existing rows, so an unseeded counter would never be kept
+    and every read would fall back to COUNT(*). Returns the names seeded.
+    """
+    existing = set(db.scalars(select(Counter.name)))
+    missing = [name for name in COUNTER_QUERIES if name not in existing]
+    db.add_all([Counter(name=name, value=db.execute(COUNTER_QUERIES[name]()).scalar() or 0) for name in missing])
+    db.commit()
+    return missing
+
+
+def increment_counter_statement(name: str, delta: int):
+    """Relative UPDATE, so concurrent writers never lose increments."""
+    return (
+        update(Counter)
+        .where(Counter.name == name)
+        .values(value=Counter.value + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def increment_counter(db: Session, name: str, delta: int = 1) -> None:
+    """Adjust a counter inside the caller's transaction; the caller commits."""
+    if delta:
+        db.execute(increment_counter_statement(name, delta))
+
+
+def adjust_comment_count(db: Session, post_id: int, delta: int) -> None:
+    """Adjust the denormalized approved-comment count on a post."""
+    if delta:
+        db.execute(
+            update(Post)
+            .where(Post.id == post_id)
+            .values(comment_count=func.coalesce(Post.comment_count, 0) + delta, updated_at=Post.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def adjust_reply_count(db: Session, root_id: Optional[int], delta: int) -> None:
+    """Adjust the denormalized approved-reply count on a thread's root comment."""
+    if root_id is not None and delta:
+        db.execute(
+            update(Comment)
+            .where(Comment.id == root_id)
+            .values(reply_count=Comment.reply_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def rebuild_counters(db: Session) -> dict:
+    """Recompute every counter, posts.comment_count and comments.reply_count from the base tables."""
+    values = {name: db.execute(query()).scalar() or 0 for name, query in COUNTER_QUERIES.items()}
+    db.execute(delete(Counter).where(Counter.name.in_(values.keys())))
+    db.add_all([Counter(name=name, value=value) for name, value in values.items()])
+
+    approved = (
+        select(func.count())
+        .select_from(Comment)
+        .where(Comment.post_id == Post.id, Comment.is_approved == True)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Post)
+        .values(comment_count=approved, updated_at=Post.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    reply = aliased(Comment)
+    replies = (
+        select(func.count())
+        .select_from(reply)
+        .where(reply.root_id == Comment.id, reply.is_approved == True)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Comment)
+        .where(Comment.parent_id.is_(None))
+        .values(reply_count=replies)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return values
@@ -0,0 +1,95 @@
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.image import Image
+from app.models.post import Post
+
+logger = logging.getLogger(__name__)
+
+
+def get_image(db: Session, sha256: str) -> Optional[Image]:
+    return db.get(Image, sha256)
+
+def register_image(db: Session, sha256: str, url: str, renditions: Optional[dict]) -> Image:
+    """
+    Record a freshly uploaded image. If the same bytes were registered
+    concurrently, the existing row wins and is returned instead.
+    """
+    db.execute(
+        pg_insert(Image)
+        .values(sha256=sha256, url=url, renditions=renditions, ref_count=0)
+        .on_conflict_do_nothing(index_elements=[Image.sha256])
+    )
+    db.commit()
+    return db.get(Image, sha256, populate_existing=True)
+
+def adjust_image_refs(db: Session, sha256: str, delta: int) -> bool:
+    """
+    Relative ref_count change inside the caller's transaction; the caller commits.
+    Returns False if the row is gone (collected by gc_images).
+    """
+    result = db.execute(
+        update(Image)
+        .where(Image.sha256 == sha256)
+        .values(ref_count=Image.ref_count + delta)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+def image_urls(url: str, renditions: Optional[dict]) -> List[str]:
+    """Every stored file of an image: the original and all of its renditions."""
+    urls = [url]
+    for size in ((renditions or {}).get("sizes") or {}).values():
+        urls.extend(url for url in size["urls"].values() if url not in urls)
+    return urls
+
+def rebuild_image_refs(db: Session) -> int:
+    """Recompute ref_count from posts.image_hash; returns how many rows were off."""
+    actual = (
+        select(func.count())
+        .select_from(Post)
+        .where(Post.image_hash == Image.sha256)
+        .scalar_subquery()
+    )
+    # Only rows that are off get touched, so updated_at (the GC grace clock) stays put otherwise
+    result = db.execute(
+        update(Image)
+        .where(Image.ref_count != actual)
+        .values(ref_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+def collect_orphan_images(db: Session, storage, grace_seconds: int) -> int:
+    """
+    Delete images no post has referenced for `grace_seconds`, row first and
+    then the stored files. The grace period covers uploads that are
+    registered but not yet attached to their post.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    orphans = db.scalars(select(Image).where(Image.ref_count <= 0, Image.updated_at < cutoff)).all()
+    collected = 0
+    for image in orphans:
+        sha256, urls = image.sha256, image_urls(image.url, image.renditions)
+        # Re-check under the row lock in case a post picked it up meanwhile
+        deleted = db.execute(
+            delete(Image)
+            .where(Image.sha256 == sha256, Image.ref_count <= 0)
+            .returning(Image.sha256)
+        ).first()
+        db.commit()
+        if not deleted:
+            continue
+        for url in urls:
+            try:
+                storage.delete(url)
+            except Exception:
+                logger.warning("Could not delete stored file %s", url, exc_info=True)
+        collected += 1
+    return collected
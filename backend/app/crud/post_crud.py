@@ -1,27 +1,193 @@
-from sqlalchemy.orm import Session
+import html
+from sqlalchemy.orm import Session, joinedload
 from app.models.post import Post
-from app.models.view import View
 from app.models.like import Like
+from app.models.view import View
+from app.models.comment import Comment
 from app.schemas.post_schema import PostCreate, PostUpdate
+from app.models.image import Image
+from app.crud.counter_crud import increment_counter, POSTS, ACTIVE_POSTS, COMMENTS
+from app.crud.image_crud import adjust_image_refs
+from app.utils.view_buffer import view_buffer
+from app.utils.response_cache import invalidate_feed, invalidate_post
+from app.utils.pagination import encode_cursor, decode_cursor, decode_datetime_cursor
 from fastapi import HTTPException, status
-from sqlalchemy import exists
+from sqlalchemy import Float, cast, column, delete, exists, func, literal_column, select, table, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Optional, Tuple
 
 def create_post(db: Session, post: PostCreate, author_id: int) -> Post:
-    db_post = Post(**post.dict(), author_id=author_id, is_active=True)
+    db_post = Post(**post.model_dump(), author_id=author_id, is_active=True)
     db.add(db_post)
+    increment_counter(db, POSTS)
+    increment_counter(db, ACTIVE_POSTS)
     db.commit()
+    invalidate_feed()
     db.refresh(db_post)
     return db_post
 
-def get_all_posts(db: Session, skip: int = 0, limit: int = 6, is_admin: bool = False):
-    query = db.query(Post)
+def get_all_posts(
+    db: Session,
+    skip: int = 0,
+    limit: int = 6,
+    is_admin: bool = False,
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = None,
+) -> Tuple[List[Post], Optional[str]]:
+    """
+    Return a page of posts, newest first, and the cursor for the next page.
+    With a cursor the page is a keyset range read on (created_at, id) and
+    `skip` is ignored; without one we fall back to offset paging.
+    For a logged-in user is_liked/is_viewed are filled in for the whole
+    page with one query each.
+    """
+    rows = db.scalars(feed_page_query(skip, limit, is_admin, cursor)).all()
+    posts, next_cursor = split_feed_page(rows, limit)
+    if user_id and posts:
+        post_ids = [post.id for post in posts]
+        liked = set(db.scalars(liked_post_ids_query(user_id, post_ids)))
+        viewed = set(db.scalars(viewed_post_ids_query(user_id, post_ids)))
+        apply_user_flags(posts, user_id, liked, viewed)
+    return posts, next_cursor
+
+
+# Statement builders shared with async_post_crud
+def feed_page_query(skip: int, limit: int, is_admin: bool, cursor: Optional[str]):
+    """Select limit + 1 posts so the caller can tell whether a next page exists."""
+    query = select(Post).options(joinedload(Post.author))
     if not is_admin:
-        query = query.filter(Post.is_active == True)
-    return query.offset(skip).limit(limit).all()
- 
+        query = query.where(Post.is_active == True)
+    query = query.order_by(Post.created_at.desc(), Post.id.desc())
+    if cursor:
+        created_at, post_id = decode_datetime_cursor(cursor)
+        query = query.where(tuple_(Post.created_at, Post.id) < tuple_(created_at, post_id))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+def split_feed_page(rows, limit: int) -> Tuple[List[Post], Optional[str]]:
+    posts = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and posts:
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+    return posts, next_cursor
+
+def liked_post_ids_query(user_id: int, post_ids: List[int]):
+    return select(Like.post_id).where(Like.user_id == user_id, Like.post_id.in_(post_ids))
+
+def viewed_post_ids_query(user_id: int, post_ids: List[int]):
+    return select(View.post_id).where(View.user_id == user_id, View.post_id.in_(post_ids))
+
+def apply_user_flags(posts: List[Post], user_id: int, liked: set, viewed: set) -> None:
+    for post in posts:
+        post.is_liked = post.id in liked
+        # Views still sitting in the write-behind buffer count as seen
+        post.is_viewed = post.id in viewed or view_buffer.is_pending(post.id, user_id)
+
+def search_posts(
+    db: Session, q: str, limit: int = 10, cursor: Optional[str] = None
+) -> Tuple[List[Post], Optional[str]]:
+    """
+    Active posts matching `q`, best match first, each with .rank,
+    .title_highlight and .snippet set: HTML-escaped text with the
+    matches wrapped in <mark>.
+    Pages are keyset ranges on (rank, id).
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        query = sqlite_search_query(q, limit, cursor)
+    else:
+        query = search_page_query(q, limit, cursor)
+    rows = db.execute(query).all()
+    posts = []
+    for post, rank, title_highlight, snippet in rows[:limit]:
+        post.rank = rank
+        post.title_highlight = _mark_matches(title_highlight)
+        post.snippet = _mark_matches(snippet)
+        posts.append(post)
+    next_cursor = None
+    if len(rows) > limit and posts:
+        next_cursor = encode_cursor(posts[-1].rank, posts[-1].id)
+    return posts, next_cursor
+
+SEARCH_CONFIG = "english"
+# Highlights come back delimited by control characters, which cannot occur in
+# a title or post; _mark_matches escapes the text and only then adds the tags.
+MATCH_START, MATCH_END = "\x02", "\x03"
+HEADLINE_OPTIONS = f"StartSel={MATCH_START}, StopSel={MATCH_END}, MaxWords=35, MinWords=15, MaxFragments=2"
+
+def _mark_matches(text: str) -> str:
+    return html.escape(text or "").replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+
+def _decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    values = decode_cursor(cursor)
+    try:
+        rank, post_id = values
+        return float(rank), int(post_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def search_page_query(q: str, limit: int, cursor: Optional[str]):
+    """
+    Postgres: rank the GIN-indexed tsvector matches, then build headlines
+    only for the limit + 1 rows of the page, since ts_headline re-parses
+    the whole document.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    # ts_rank is float4; as float8 the cursor's Python float compares exactly
+    rank = cast(func.ts_rank(Post.search_vector, tsquery), Float(precision=53))
+    page = select(Post.id, rank.label("rank")).where(
+        Post.is_active == True, Post.search_vector.op("@@")(tsquery)
+    )
+    if cursor:
+        after_rank, after_id = _decode_search_cursor(cursor)
+        page = page.where(tuple_(rank, Post.id) < tuple_(after_rank, after_id))
+    page = page.order_by(rank.desc(), Post.id.desc()).limit(limit + 1).subquery()
+    return (
+        select(
+            Post,
+            page.c.rank,
+            func.ts_headline(SEARCH_CONFIG, Post.title, tsquery, f"HighlightAll=true, StartSel={MATCH_START}, StopSel={MATCH_END}"),
+            func.ts_headline(SEARCH_CONFIG, Post.content, tsquery, HEADLINE_OPTIONS),
+        )
+        .join(page, page.c.id == Post.id)
+        .options(joinedload(Post.author))
+        .order_by(page.c.rank.desc(), Post.id.desc())
+    )
+
+def sqlite_search_query(q: str, limit: int, cursor: Optional[str]):
+    """SQLite fallback over the posts_fts FTS5 table (see models/post.py)."""
+    fts = table("posts_fts", column("rowid"), column("posts_fts"), schema="boom_blog")
+    fts_ref = literal_column("posts_fts")
+    # bm25 is lower-is-better; negate so both backends sort rank descending
+    rank = -func.bm25(fts_ref, 10.0, 5.0)
+    # Quote every term so user input can never be parsed as FTS5 syntax
+    match = " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+    query = (
+        select(
+            Post,
+            rank.label("rank"),
+            func.highlight(fts_ref, 0, MATCH_START, MATCH_END),
+            func.snippet(fts_ref, 1, MATCH_START, MATCH_END, "…", 24),
+        )
+        .join(fts, fts.c.rowid == Post.id)
+        .where(fts.c.posts_fts.op("MATCH")(match), Post.is_active == True)
+        .options(joinedload(Post.author))
+    )
+    if cursor:
+        after_rank, after_id = _decode_search_cursor(cursor)
+        query = query.where(tuple_(rank, Post.id) < tuple_(after_rank, after_id))
+    return query.order_by(rank.desc(), Post.id.desc()).limit(limit + 1)
+
+def active_post_query(post_id: int):
+    return (
+        select(Post)
+        .options(joinedload(Post.author))
+        .where(Post.id == post_id, Post.is_active == True)
+    )
+
 
 def get_post_by_id(db: Session, post_id: int, user_id: int = None):
-    post = db.query(Post).filter(Post.id == post_id, Post.is_active == True).first()
+    post = db.scalars(active_post_query(post_id)).first()
     if not post:
         return None
 
@@ -29,67 +195,133 @@ def get_post_by_id(db: Session, post_id: int, user_id: int = None):
     is_viewed = False
 
     if user_id:
-
-        add_view(db, post_id, user_id)
+        # Read-only: the view is buffered and written behind by view_buffer
+        view_buffer.record(post_id, user_id)
+        is_viewed = True
 
         is_liked = db.query(
             exists().where(Like.post_id == post_id, Like.user_id == user_id)
         ).scalar()
-        is_viewed = db.query(
-            exists().where(View.post_id == post_id, View.user_id == user_id)
-        ).scalar()
 
     post.is_liked = is_liked
     post.is_viewed = is_viewed
     return post
 
 def update_post(db: Session, db_post: Post, updates: PostUpdate) -> Post:
-    for key, value in updates.dict(exclude_unset=True).items():
+    for key, value in updates.model_dump(exclude_unset=True).items():
         setattr(db_post, key, value)
     db.commit()
+    invalidate_feed()
     db.refresh(db_post)
     return db_post
 
+def set_post_image(db: Session, post_id: int, image_status: str, image: Optional[Image] = None) -> bool:
+    """
+    Record the outcome of an image upload. With `image` the post switches
+    to it and the images' ref counts move along; without, the post keeps
+    its current picture and only image_status changes.
+
+    Returns False, recording nothing, if gc_images deleted `image` since it
+    was looked up; the caller has to upload the file again.
+    """
+    values = {"image_status": image_status, "updated_at": Post.updated_at}
+    if image is not None:
+        current = db.execute(select(Post.image_hash).where(Post.id == post_id).with_for_update()).first()
+        if current is None:
+            return True  # deleted while its image was uploading
+        if current.image_hash != image.sha256:
+            # Takes the image row lock gc_images re-checks ref_count under, so
+            # once this matches a row the image can no longer be collected
+            if not adjust_image_refs(db, image.sha256, 1):
+                db.rollback()
+                return False
+            if current.image_hash:
+                adjust_image_refs(db, current.image_hash, -1)
+        values.update(image_url=image.url, image_renditions=image.renditions, image_hash=image.sha256)
+    db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    invalidate_post(post_id)
+    return True
+
 def delete_post(db: Session, db_post: Post) -> None:
+    post_id = db_post.id
+    increment_counter(db, POSTS, -1)
+    if db_post.is_active:
+        increment_counter(db, ACTIVE_POSTS, -1)
+    # One statement, so replies and their parents go together
+    removed = db.execute(
+        delete(Comment).where(Comment.post_id == post_id).execution_options(synchronize_session=False)
+    ).rowcount
+    increment_counter(db, COMMENTS, -removed)
+    if db_post.image_hash:
+        adjust_image_refs(db, db_post.image_hash, -1)
     db.delete(db_post)
     db.commit()
+    invalidate_post(post_id)
 
 def toggle_like(db: Session, post_id: int, user_id: int):
-    existing_like = db.query(Like).filter_by(post_id=post_id, user_id=user_id).first()
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    if existing_like:
-        db.delete(existing_like)
-        post.like_count = max(post.like_count - 1, 0)
-        is_liked = False
+    """
+    Toggle a like without reading the Like or Post rows into Python:
+    DELETE ... RETURNING, else INSERT ... ON CONFLICT DO NOTHING RETURNING,
+    then a relative like_count UPDATE ... RETURNING. Concurrent toggles can
+    no longer lose updates. The caller has already checked the post exists.
+    """
+    unliked = db.execute(unlike_statement(post_id, user_id)).first() is not None
+    if unliked:
+        delta = -1
     else:
-        new_like = Like(post_id=post_id, user_id=user_id)
-        db.add(new_like)
-        post.like_count += 1
-        is_liked = True
+        # Nothing inserted means a concurrent request already liked it
+        delta = 1 if db.execute(like_statement(post_id, user_id)).first() is not None else 0
+    like_count = db.execute(like_count_statement(post_id, delta)).scalar()
+    if like_count is None:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
     db.commit()
-    db.refresh(post)
-    return post.like_count, is_liked
+    return like_count, not unliked
 
-def add_view(db: Session, post_id: int, user_id: int) -> int:
-    existing_view = db.query(View).filter_by(post_id=post_id, user_id=user_id).first()
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        return 0
-    if not existing_view:
-        new_view = View(post_id=post_id, user_id=user_id)
-        db.add(new_view)
-        post.view_count += 1
-    db.commit()
-    db.refresh(post)
-    return post.view_count
+# Statement builders shared with async_post_crud
+def unlike_statement(post_id: int, user_id: int):
+    return (
+        delete(Like)
+        .where(Like.post_id == post_id, Like.user_id == user_id)
+        .returning(Like.post_id)
+        .execution_options(synchronize_session=False)
+    )
+
+def like_statement(post_id: int, user_id: int):
+    return (
+        pg_insert(Like)
+        .values(post_id=post_id, user_id=user_id)
+        .on_conflict_do_nothing()
+        .returning(Like.post_id)
+    )
+
+def like_count_statement(post_id: int, delta: int):
+    if not delta:
+        return select(Post.like_count).where(Post.id == post_id)
+    return (
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            like_count=func.greatest(func.coalesce(Post.like_count, 0) + delta, 0),
+            updated_at=Post.updated_at,
+        )
+        .returning(Post.like_count)
+        .execution_options(synchronize_session=False)
+    )
 
 def toggle_post_active(db: Session, post_id: int):
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
     post.is_active = not post.is_active
+    increment_counter(db, ACTIVE_POSTS, 1 if post.is_active else -1)
     db.commit()
+    invalidate_post(post_id)
     db.refresh(post)
     return post
\ No newline at end of file
@@ -0,0 +1,115 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Float, and_, cast, delete, exists, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import joinedload
+
+from app.core.config import settings
+from app.models.post import Post
+from app.models.post_score import PostScore
+from app.utils.pagination import decode_cursor
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+# Engagement weights: a comment is worth more than a like, a view much less
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+VIEW_WEIGHT = 0.1
+
+# pg_try_advisory_lock key, so only one worker process refreshes at a time
+REFRESH_LOCK_ID = 4242018
+
+
+def score_expression(now: datetime):
+    """
+    (weighted engagement + 1) / (age in hours + 2) ^ TRENDING_GRAVITY,
+    evaluated by Postgres over a whole batch of posts at once.
+    """
+    age_seconds = cast(func.extract("epoch", literal(now) - Post.created_at), Float)
+    age_hours = func.greatest(age_seconds / 3600.0, 0.0, type_=Float)
+    engagement = (
+        func.coalesce(Post.like_count, 0) * LIKE_WEIGHT
+        + func.coalesce(Post.comment_count, 0) * COMMENT_WEIGHT
+        + func.coalesce(Post.view_count, 0) * VIEW_WEIGHT
+        + 1
+    )
+    return engagement / func.power(age_hours + 2, settings.TRENDING_GRAVITY, type_=Float)
+
+
+def refresh_post_scores(conn: Connection) -> int:
+    """
+    Recompute post_scores for active posts inside the trending window,
+    TRENDING_BATCH_SIZE posts per INSERT ... SELECT ... ON CONFLICT, each
+    batch in its own short transaction. Posts that aged out or were hidden
+    are dropped first. Returns the number of posts scored.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+    in_window = and_(Post.is_active == True, Post.created_at >= cutoff)
+
+    conn.execute(delete(PostScore).where(~exists().where(Post.id == PostScore.post_id, in_window)))
+    conn.commit()
+
+    scored = 0
+    last_id = 0
+    while True:
+        batch = (
+            select(Post.id, score_expression(now), literal(now))
+            .where(in_window, Post.id > last_id)
+            .order_by(Post.id)
+            .limit(settings.TRENDING_BATCH_SIZE)
+        )
+        upsert = pg_insert(PostScore).from_select(["post_id", "score", "computed_at"], batch)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[PostScore.post_id],
+            set_={"score": upsert.excluded.score, "computed_at": upsert.excluded.computed_at},
+        ).returning(PostScore.post_id)
+        ids = conn.execute(upsert).scalars().all()
+        conn.commit()
+        if not ids:
+            break
+        scored += len(ids)
+        last_id = max(ids)
+        if len(ids) < settings.TRENDING_BATCH_SIZE:
+            break
+    return scored
+
+
+def refresh_trending(engine: Engine) -> Optional[int]:
+    """Run refresh_post_scores unless another process already is; returns posts scored or None."""
+    with engine.connect() as conn:
+        if not conn.execute(select(func.pg_try_advisory_lock(REFRESH_LOCK_ID))).scalar():
+            conn.rollback()
+            return None
+        conn.commit()
+        try:
+            return refresh_post_scores(conn)
+        finally:
+            conn.rollback()
+            conn.execute(select(func.pg_advisory_unlock(REFRESH_LOCK_ID)))
+            conn.commit()
+
+
+# Statement builder shared with async_post_crud
+def trending_page_query(limit: int, cursor: Optional[str]):
+    """Range read on ix_post_scores_rank; limit + 1 rows so the caller can tell if there is a next page."""
+    query = (
+        select(Post, PostScore.score)
+        .join(PostScore, PostScore.post_id == Post.id)
+        .options(joinedload(Post.author))
+        # A post hidden since the last refresh must not show up
+        .where(Post.is_active == True)
+        .order_by(PostScore.score.desc(), PostScore.post_id.desc())
+    )
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            score, post_id = float(values[0]), int(values[1])
+        except (ValueError, TypeError, IndexError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.where(tuple_(PostScore.score, PostScore.post_id) < tuple_(score, post_id))
+    return query.limit(limit + 1)
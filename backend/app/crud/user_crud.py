@@ -3,6 +3,8 @@ from typing import List, Optional
 from app.models.user import User
 from app.schemas.user_schema import UserCreate, UserUpdate
 from app.utils.security import get_password_hash  # ✅ Correct import
+from app.crud.counter_crud import increment_counter, USERS
+from app.utils.principal_cache import invalidate_principal
 
 # ----------- CRUD Functions ----------- #
 
@@ -22,6 +24,7 @@ def create_user(db: Session, user: UserCreate) -> User:
         hashed_password=get_password_hash(user.password)
     )
     db.add(db_user)
+    increment_counter(db, USERS)
     db.commit()
     db.refresh(db_user)
     return db_user
@@ -39,9 +42,13 @@ def update_user(db: Session, db_user: User, updates: UserUpdate) -> User:
         db_user.is_admin = updates.is_admin
 
     db.commit()
+    invalidate_principal(db_user.id)
     db.refresh(db_user)
     return db_user
 
 def delete_user(db: Session, db_user: User) -> None:
+    user_id = db_user.id
+    increment_counter(db, USERS, -1)
     db.delete(db_user)
     db.commit()
+    invalidate_principal(user_id)
@@ -1,13 +1,86 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool, pool_status
+
+
+def to_async_url(url: str):
+    """postgresql[+psycopg2]://... -> postgresql+asyncpg://... (sqlite:// -> sqlite+aiosqlite://)"""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url.set(drivername="postgresql+asyncpg")
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def _attach_schema(engine) -> None:
+    """
+    SQLite has no schemas: attach a sibling file as DB_SCHEMA so the
+    models' schema-qualified tables resolve. For tests and local runs
+    against SQLite files; Postgres-only statements still need Postgres.
+    """
+    root, ext = os.path.splitext(engine.url.database)
+    path = f"{root}_{settings.DB_SCHEMA}{ext or '.db'}"
+
+    @event.listens_for(engine, "connect")
+    def _attach(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"ATTACH DATABASE '{path}' AS {settings.DB_SCHEMA}")
+        cursor.close()
+
+def _pool_kwargs() -> dict:
+    return dict(
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+def create_db_engine(url: str):
+    """The one place a sync (psycopg2) engine is configured."""
+    if _is_sqlite(url):
+        sqlite_engine = create_engine(
+            url, poolclass=InstrumentedQueuePool, connect_args={"check_same_thread": False}, **_pool_kwargs()
+        )
+        _attach_schema(sqlite_engine)
+        return sqlite_engine
+    options = f"-csearch_path={settings.DB_SCHEMA} -cstatement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        connect_args={"options": options},
+        **_pool_kwargs(),
+    )
+
+def create_async_db_engine(url: str):
+    """The one place an async (asyncpg) engine is configured."""
+    if _is_sqlite(url):
+        sqlite_engine = create_async_engine(
+            to_async_url(url), poolclass=InstrumentedAsyncQueuePool, **_pool_kwargs()
+        )
+        _attach_schema(sqlite_engine.sync_engine)
+        return sqlite_engine
+    server_settings = {
+        "search_path": settings.DB_SCHEMA,
+        "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+    }
+    return create_async_engine(
+        to_async_url(url),
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args={"server_settings": server_settings},
+        **_pool_kwargs(),
+    )
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    connect_args={"options": f"-csearch_path={settings.DB_SCHEMA}"}
-)
+
+engine = create_db_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -18,3 +91,26 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# -------- Async (asyncpg) engine -------- #
+async_engine = create_async_db_engine(settings.DATABASE_URL)
+
+# expire_on_commit=False: attributes stay loaded after commit, since an
+# AsyncSession cannot lazy-load them during response serialization.
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# -------- Pool telemetry -------- #
+# Every engine the app owns, by name, so their pools can be inspected.
+engines = {
+    "primary": engine,
+    "primary_async": async_engine.sync_engine,
+}
+
+def get_pool_stats() -> dict:
+    return {name: pool_status(eng.pool) for name, eng in engines.items()}
@@ -0,0 +1,17 @@
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.crud.image_crud import rebuild_image_refs, collect_orphan_images
+from app.utils.storage import get_storage
+
+def main():
+    db = SessionLocal()
+    try:
+        fixed = rebuild_image_refs(db)
+        collected = collect_orphan_images(db, get_storage(), settings.IMAGE_GC_GRACE_SECONDS)
+    finally:
+        db.close()
+    print(f"Reference counts corrected: {fixed}")
+    print(f"Orphaned images deleted: {collected}")
+
+if __name__ == "__main__":
+    main()
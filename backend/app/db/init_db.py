@@ -1,9 +1,32 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.counter_crud import seed_counters
 from app.db.database import Base, engine
-from app.models import user  # import all models here
+from app import models  # noqa: F401  registers every table on Base.metadata
+
+logger = logging.getLogger(__name__)
+
 
 def init_db():
+    """
+    Create the schema and any missing tables straight from the models.
+    For local development and throwaway databases only: production schemas
+    are owned by Alembic (`alembic upgrade head`).
+    """
+    with engine.connect() as conn:
+        conn.execute(text("CREATE SCHEMA IF NOT EXISTS boom_blog"))
+        conn.commit()
     Base.metadata.create_all(bind=engine)
-    print("Tables created successfully!")
+    # Alembic seeds these in a migration; create_all leaves the table empty
+    with Session(engine) as db:
+        seeded = seed_counters(db)
+    if seeded:
+        logger.info("Seeded counters: %s", ", ".join(seeded))
+    logger.info("Schema and tables ensured in database")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     init_db()
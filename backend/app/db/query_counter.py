@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Records every SQL statement an engine sends while it is active."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return False
+
+
+@contextmanager
+def assert_num_queries(engine: Engine, expected: int):
+    """
+    Fail if the block issues anything other than `expected` statements.
+    Use it around a TestClient call to pin an endpoint's query budget; async
+    routes run on async_engine, whose statements go through its sync_engine:
+
+        with assert_num_queries(async_engine.sync_engine, 2):
+            client.get("/posts/")
+
+    tests/test_query_counts.py pins the hot read endpoints this way.
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+    if counter.count != expected:
+        listing = "\n".join(f"  {i + 1}. {sql}" for i, sql in enumerate(counter.statements))
+        raise AssertionError(f"Expected {expected} SQL statements, got {counter.count}:\n{listing}")
@@ -0,0 +1,15 @@
+from app.db.database import SessionLocal
+from app.crud.counter_crud import rebuild_counters
+
+def main():
+    db = SessionLocal()
+    try:
+        values = rebuild_counters(db)
+    finally:
+        db.close()
+    for name, value in values.items():
+        print(f"{name}: {value}")
+    print("Counters rebuilt successfully!")
+
+if __name__ == "__main__":
+    main()
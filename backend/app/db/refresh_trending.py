@@ -0,0 +1,12 @@
+from app.db.database import engine
+from app.crud.trending_crud import refresh_trending
+
+def main():
+    scored = refresh_trending(engine)
+    if scored is None:
+        print("Another process is refreshing trending scores; skipped.")
+    else:
+        print(f"Trending scores refreshed for {scored} posts.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.database import (
+    SessionLocal,
+    AsyncSessionLocal,
+    create_db_engine,
+    create_async_db_engine,
+    engines,
+)
+from app.utils.security import decode_token
+
+# -------------------------------------------------------------------
+# Replica sessions (fall back to the primary when none are configured)
+# -------------------------------------------------------------------
+_replica_sessions = []
+_replica_async_sessions = []
+for i, url in enumerate(settings.replica_urls):
+    replica_engine = create_db_engine(url)
+    replica_async_engine = create_async_db_engine(url)
+    engines[f"replica_{i}"] = replica_engine
+    engines[f"replica_{i}_async"] = replica_async_engine.sync_engine
+    _replica_sessions.append(sessionmaker(autocommit=False, autoflush=False, bind=replica_engine))
+    _replica_async_sessions.append(
+        async_sessionmaker(replica_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    )
+
+_next_replica = itertools.cycle(range(len(_replica_sessions))) if _replica_sessions else None
+
+# -------------------------------------------------------------------
+# Read-your-writes: users who wrote recently read from the primary
+# -------------------------------------------------------------------
+# The deadline travels in a cookie, so it holds on whichever worker serves
+# the next read. This process also remembers its own writers, for clients
+# that drop cookies; entries are kept in expiry order and pruned on write.
+READ_YOUR_WRITES_COOKIE = "boom_rw"
+
+_recent_writers: "OrderedDict[int, float]" = OrderedDict()
+_writers_lock = threading.Lock()
+
+def mark_write(user_id: int, response: Optional[Response] = None) -> None:
+    """Pin this user's reads to the primary for READ_YOUR_WRITES_SECONDS."""
+    now = time.monotonic()
+    with _writers_lock:
+        _recent_writers.pop(user_id, None)
+        _recent_writers[user_id] = now + settings.READ_YOUR_WRITES_SECONDS
+        while next(iter(_recent_writers.values())) < now:
+            _recent_writers.popitem(last=False)
+    if response is not None:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(int(time.time()) + settings.READ_YOUR_WRITES_SECONDS),
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+
+def _recently_wrote(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    with _writers_lock:
+        until = _recent_writers.get(user_id)
+    return until is not None and until >= time.monotonic()
+
+def _cookie_says_wrote(request: Request) -> bool:
+    try:
+        until = int(request.cookies[READ_YOUR_WRITES_COOKIE])
+    except (KeyError, ValueError):
+        return False
+    now = time.time()
+    # A forged far-future value would pin the client to the primary for good
+    return now <= until <= now + settings.READ_YOUR_WRITES_SECONDS + 1
+
+def _user_id_from_request(request: Request) -> Optional[int]:
+    """Best-effort user id from the bearer token, without touching the database."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_token(token)
+    try:
+        return int(payload["sub"]) if payload else None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _use_replica(request: Request) -> bool:
+    if _next_replica is None or _cookie_says_wrote(request):
+        return False
+    return not _recently_wrote(_user_id_from_request(request))
+
+# -------------------------------------------------------------------
+# Dependencies for read-only routes
+# -------------------------------------------------------------------
+def get_read_db(request: Request):
+    factory = _replica_sessions[next(_next_replica)] if _use_replica(request) else SessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_read_async_db(request: Request):
+    factory = _replica_async_sessions[next(_next_replica)] if _use_replica(request) else AsyncSessionLocal
+    async with factory() as db:
+        yield db
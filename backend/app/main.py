@@ -1,24 +1,52 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from app.api.api import api_router
 from app.core.config import settings
-from app.db.database import Base, engine
-from sqlalchemy import text
+from app.db.database import engine, async_engine
+from app.utils.view_buffer import view_buffer
+from app.utils.password_hasher import password_hasher
+from app.utils.image_pipeline import image_uploader
+from app.utils.metrics import MetricsMiddleware
+from app.utils.storage import get_storage
+from app.utils.trending import run_trending_refresh
 
-from app.models import comment, like, post, user, view  
 
-
-def init_db():
-    """Ensure schema + tables exist."""
-    with engine.connect() as conn:
-       
-        conn.execute(text("CREATE SCHEMA IF NOT EXISTS boom_blog"))
-        conn.commit()
-    Base.metadata.create_all(bind=engine)
-    print(" Schema and tables ensured in database.")
-
-
-init_db()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing above touches the network, so importing this module stays cheap;
+    # all connecting happens here, once per worker.
+    if settings.DB_CREATE_ALL:
+        from app.db.init_db import init_db
+        await run_in_threadpool(init_db)
+    view_flush_task = asyncio.create_task(
+        view_buffer.run(async_engine, settings.VIEW_FLUSH_INTERVAL_SECONDS)
+    )
+    trending_task = None
+    if settings.TRENDING_REFRESH_SECONDS > 0:
+        trending_task = asyncio.create_task(
+            run_trending_refresh(engine, settings.TRENDING_REFRESH_SECONDS)
+        )
+    get_storage()  # fail at startup, not on the first upload, if storage is misconfigured
+    image_uploader.resume()
+    try:
+        yield
+    finally:
+        view_flush_task.cancel()
+        if trending_task:
+            trending_task.cancel()
+        # A flush cut off mid-way requeues what it drained; wait for that first
+        with suppress(asyncio.CancelledError):
+            await view_flush_task
+        # Don't lose the views buffered since the last tick
+        await view_buffer.flush(async_engine)
+        password_hasher.shutdown()
+        image_uploader.shutdown()
 
 
 app = FastAPI(
@@ -26,7 +54,11 @@ app = FastAPI(
     version="1.0.0",
     description="Backend Boom Box",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    # orjson for every route that returns plain data; list pages bypass
+    # this through app.utils.serialization
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -48,8 +80,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    # Added last so it is the outermost middleware and times everything else
+    app.add_middleware(MetricsMiddleware, token=settings.METRICS_TOKEN)
+
 app.include_router(api_router)
 
+if settings.STORAGE_BACKEND == "local":
+    os.makedirs(settings.LOCAL_STORAGE_DIR, exist_ok=True)
+    app.mount(settings.LOCAL_STORAGE_URL, StaticFiles(directory=settings.LOCAL_STORAGE_DIR), name="media")
+
 
 @app.get("/", tags=["Root"])
 async def root():
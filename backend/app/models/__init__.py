@@ -2,4 +2,7 @@ from .user import User
 from .post import Post
 from .comment import Comment
 from .like import Like
-from .view import View
\ No newline at end of file
+from .view import View
+from .counter import Counter
+from .image import Image
+from .post_score import PostScore
\ No newline at end of file
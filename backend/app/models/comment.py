@@ -1,11 +1,10 @@
-from sqlalchemy import Column, Integer, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
 
 class Comment(Base):
     __tablename__ = "comments"
-    __table_args__ = {"schema": "boom_blog"}
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -13,5 +12,30 @@ class Comment(Base):
     is_approved = Column(Boolean, default=False)
     post_id = Column(Integer, ForeignKey("boom_blog.posts.id"))  
     user_id = Column(Integer, ForeignKey("boom_blog.users.id"))  
+    # Threading: top-level comments have no parent/root and depth 0. path is
+    # the zero-padded ids from the root down, so ORDER BY path walks a thread
+    # depth-first and a subtree is everything under "<path>/".
+    parent_id = Column(Integer, ForeignKey("boom_blog.comments.id", ondelete="CASCADE"), nullable=True)
+    root_id = Column(Integer, ForeignKey("boom_blog.comments.id", ondelete="CASCADE"), nullable=True)
+    depth = Column(Integer, nullable=False, default=0)
+    path = Column(String, nullable=True)
+    reply_count = Column(Integer, nullable=False, default=0)  # approved replies under a root, kept by comment_crud
     post = relationship("Post", back_populates="comments")
     user = relationship("User")
+    # Never lazy-loaded: comment_crud fills it from one query per page
+    replies = relationship("Comment", foreign_keys=[parent_id], lazy="noload", passive_deletes=True)
+
+    __table_args__ = (
+        # Top-level pages: WHERE post_id AND is_approved ORDER BY created_at, id
+        Index(
+            "ix_comments_post_page", post_id, is_approved, created_at, id,
+            postgresql_where=parent_id.is_(None),
+        ),
+        # Replies of a set of roots, depth-first
+        Index("ix_comments_root_path", root_id, path),
+        # Whole-post deletes and foreign key checks on parent/user deletes
+        Index("ix_comments_post_id", post_id),
+        Index("ix_comments_parent_id", parent_id),
+        Index("ix_comments_user_id", user_id),
+        {"schema": "boom_blog"},
+    )
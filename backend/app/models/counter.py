@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, BigInteger
+from app.db.database import Base
+
+class Counter(Base):
+    __tablename__ = "counters"
+    __table_args__ = {"schema": "boom_blog"}
+
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
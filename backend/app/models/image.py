@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from datetime import datetime
+from app.db.database import Base
+
+class Image(Base):
+    """One stored upload, keyed by the SHA-256 of its bytes and shared by every post that uses it."""
+    __tablename__ = "images"
+    __table_args__ = {"schema": "boom_blog"}
+
+    sha256 = Column(String(64), primary_key=True)
+    url = Column(String, nullable=False)
+    renditions = Column(JSON, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)  # posts whose image_hash is this image
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
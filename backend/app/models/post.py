@@ -1,21 +1,81 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, JSON, DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.database import Base
 
 class Post(Base):
     __tablename__ = "posts"
-    __table_args__ = {"schema": "boom_blog"}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
     image_url = Column(String, nullable=True)
+    image_status = Column(String, nullable=True)  # None (no image), pending, ready or failed
+    image_renditions = Column(JSON, nullable=True)  # resized variants, see utils/renditions.py
+    image_hash = Column(String(64), nullable=True)  # images.sha256, for ref counting
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     author_id = Column(Integer, ForeignKey("boom_blog.users.id"))
     is_active = Column(Boolean, default=True) 
     like_count = Column(Integer, default=0)
     view_count = Column(Integer, default=0)
+    comment_count = Column(Integer, default=0)  # approved comments, kept by comment_crud
+    # Weighted title (A) + content (B), maintained by a trigger; never loaded with the post
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
     author = relationship("User", back_populates="posts")
-    comments = relationship("Comment", back_populates="post", cascade="all, delete")
+    # Deleted in bulk by post_crud.delete_post; never loaded just to delete them
+    comments = relationship("Comment", back_populates="post", cascade="all, delete", passive_deletes=True)
+
+    __table_args__ = (
+        # Keyset feed: WHERE is_active ORDER BY created_at DESC, id DESC
+        Index("ix_posts_feed", is_active, created_at.desc(), id.desc()),
+        Index("ix_posts_image_hash", image_hash),
+        Index("ix_posts_author_id", author_id),
+        Index("ix_posts_search", search_vector, postgresql_using="gin").ddl_if(dialect="postgresql"),
+        {"schema": "boom_blog"},
+    )
+
+
+# Search plumbing for databases built with create_all; the Alembic migration
+# sets up the same thing on existing Postgres databases.
+for statement in (
+    """
+    CREATE OR REPLACE FUNCTION boom_blog.posts_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER posts_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, content ON boom_blog.posts
+    FOR EACH ROW EXECUTE FUNCTION boom_blog.posts_search_vector_update()
+    """,
+):
+    event.listen(Post.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+# SQLite has no tsvector: tests and local runs search an FTS5 index instead
+for statement in (
+    "CREATE VIRTUAL TABLE boom_blog.posts_fts USING fts5(title, content, content='posts', content_rowid='id')",
+    """
+    CREATE TRIGGER boom_blog.posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER boom_blog.posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER boom_blog.posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+):
+    event.listen(Post.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
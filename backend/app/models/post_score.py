@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.db.database import Base
+
+class PostScore(Base):
+    """Trending score of a recent active post, recomputed periodically by trending_crud."""
+    __tablename__ = "post_scores"
+
+    post_id = Column(Integer, ForeignKey("boom_blog.posts.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Trending feed: ORDER BY score DESC, post_id DESC
+        Index("ix_post_scores_rank", score.desc(), post_id.desc()),
+        {"schema": "boom_blog"},
+    )
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from app.db.database import Base
 
 class View(Base):
     __tablename__ = "views"
-    __table_args__ = {"schema": "boom_blog"}
     
     user_id = Column(Integer, ForeignKey("boom_blog.users.id"), primary_key=True) 
-    post_id = Column(Integer, ForeignKey("boom_blog.posts.id"), primary_key=True)  
+    post_id = Column(Integer, ForeignKey("boom_blog.posts.id"), primary_key=True)
+
+    __table_args__ = (
+        # The primary key leads with user_id; per-post lookups and FK checks need this
+        Index("ix_views_post_id", post_id),
+        {"schema": "boom_blog"},
+    )
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
 from datetime import datetime
 from app.schemas.user_schema import UserResponse
 
@@ -7,7 +7,7 @@ class CommentBase(BaseModel):
     content: str
 
 class CommentCreate(CommentBase):
-    pass
+    parent_id: Optional[int] = None  # reply to this comment
 
 class CommentUpdate(BaseModel):
     content: Optional[str] = None
@@ -20,6 +20,9 @@ class CommentResponse(CommentBase):
     is_approved: bool
     created_at: datetime
     user: UserResponse
+    parent_id: Optional[int] = None
+    depth: int = 0
+    reply_count: int = 0
+    replies: List["CommentResponse"] = []
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,8 +1,19 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, Optional
 from datetime import datetime
 from app.schemas.user_schema import UserResponse
 
+class ImageRendition(BaseModel):
+    width: int
+    height: int
+    urls: Dict[str, str]  # format ("webp", "jpeg", ...) -> URL
+
+
+class ImageRenditions(BaseModel):
+    sizes: Dict[str, ImageRendition]  # "thumb", "card", "full"
+    srcset: Dict[str, str]  # format -> ready-made srcset attribute value
+
+
 # Base schema for post data
 class PostBase(BaseModel):
     title: str
@@ -11,13 +22,14 @@ class PostBase(BaseModel):
 
 
 class PostCreate(PostBase): 
-    pass
+    image_status: Optional[str] = None
 
 
 class PostUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
     image_url: Optional[str] = None
+    image_status: Optional[str] = None
 
 
 class PostResponse(PostBase):
@@ -30,7 +42,14 @@ class PostResponse(PostBase):
     is_liked: Optional[bool] = None
     is_viewed: Optional[bool] = None
     is_active: Optional[bool] = None
+    image_status: Optional[str] = None
+    image_renditions: Optional[ImageRenditions] = None
     author: UserResponse
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PostSearchResult(PostResponse):
+    rank: float
+    title_highlight: str  # HTML-escaped title, matches wrapped in <mark>
+    snippet: str  # HTML-escaped best-matching excerpt of the content, matches in <mark>
\ No newline at end of file
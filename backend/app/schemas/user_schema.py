@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional, List
 
 class UserBase(BaseModel):
@@ -19,6 +19,8 @@ class UserUpdate(BaseModel):
 
 class UserResponse(UserBase):
     id: int
+    # Stored addresses were validated on the way in; re-running email
+    # validation for every author on every page is pure overhead
+    email: str
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,10 +1,10 @@
-import os
 import logging
+from functools import lru_cache
 
 import cloudinary
 import cloudinary.uploader
-from dotenv import load_dotenv
-from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
 
 # -------------------------------------------------------------------
 # Logging configuration
@@ -22,73 +22,51 @@ if not logger.handlers:
     logger.addHandler(handler)
 
 # -------------------------------------------------------------------
-# Environment & Cloudinary config
+# Cloudinary config
 # -------------------------------------------------------------------
-load_dotenv()
+@lru_cache
+def configure_cloudinary() -> None:
+    """Configure the SDK from Settings on first use instead of at import time."""
+    missing = [
+        name for name in ("CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET")
+        if not getattr(settings, name)
+    ]
+    if missing:
+        raise RuntimeError(f"Cloudinary storage needs {', '.join(missing)} to be set")
+    cloudinary.config(
+        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+        api_key=settings.CLOUDINARY_API_KEY,
+        api_secret=settings.CLOUDINARY_API_SECRET,
+        secure=True,
+    )
+
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True,
-)
-print("Cloud name:", cloudinary.config().cloud_name)
-print("API key present:", bool(cloudinary.config().api_key))
-print("API secret present:", bool(cloudinary.config().api_secret))
 # -------------------------------------------------------------------
 # Upload helper
 # -------------------------------------------------------------------
-def upload_to_cloudinary(file: UploadFile, folder: str = "Boom") -> str:
+def upload_to_cloudinary(path: str, folder: str = "Boom") -> str:
     """
-    Uploads an image to Cloudinary and returns the secure URL.
-
-    Args:
-        file: FastAPI UploadFile object (cropped image from frontend)
-        folder: Cloudinary folder to store the image (default: "Boom")
+    Uploads an image file from local disk to Cloudinary and returns the secure URL.
 
-    Returns:
-        str: Secure URL of the uploaded image
-
-    Raises:
-        HTTPException: If the file is invalid or upload fails
+    Called from the background upload worker, so failures are raised as-is
+    for the worker to retry rather than turned into HTTP errors.
     """
-    logger.info("Received upload request for folder: %s", folder)
-
-    allowed_types = {"image/jpeg", "image/png", "image/gif"}
-    if file.content_type not in allowed_types:
-        logger.warning("Invalid content type: %s", file.content_type)
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file type. Only JPEG, PNG, and GIF are allowed.",
-        )
-
-    # Some UploadFile objects may not have .size; fall back to len(file.file.read()) if needed
-    max_size = 5 * 1024 * 1024  # 5 MB
-    size = getattr(file, "size", None)
-    if size is None:
-        try:
-            pos = file.file.tell()
-            file.file.seek(0, os.SEEK_END)
-            size = file.file.tell()
-            file.file.seek(pos)
-        except Exception:
-            logger.warning("Could not determine file size reliably.")
-            size = 0
+    configure_cloudinary()
+    logger.info("Uploading %s to Cloudinary folder: %s", path, folder)
+    result = cloudinary.uploader.upload(path, folder=folder, resource_type="image")
+    secure_url = result["secure_url"]
+    logger.info("Upload successful: %s", secure_url)
+    return secure_url
 
-    if size and size > max_size:
-        logger.warning("File too large: %s bytes", size)
-        raise HTTPException(status_code=400, detail="File size exceeds 5MB limit.")
 
-    try:
-        logger.info("Uploading file to Cloudinary folder: %s", folder)
-        result = cloudinary.uploader.upload(
-            file.file,
-            folder=folder,
-            resource_type="image",
-        )
-        secure_url = result.get("secure_url")
-        logger.info("Upload successful: %s", secure_url)
-        return secure_url
-    except Exception as e:
-        logger.exception("Failed to upload to Cloudinary")
-        raise HTTPException(status_code=500, detail=f"Failed to upload to Cloudinary: {e}")
+def delete_from_cloudinary(url: str) -> None:
+    """Delete an image by the secure URL upload_to_cloudinary returned."""
+    configure_cloudinary()
+    # .../image/upload/v1712345678/Boom/abc123.jpg -> public_id "Boom/abc123"
+    path = url.split("/upload/", 1)[1]
+    parts = path.split("/")
+    if parts[0].startswith("v") and parts[0][1:].isdigit():
+        parts = parts[1:]
+    public_id = "/".join(parts).rsplit(".", 1)[0]
+    logger.info("Deleting %s from Cloudinary", public_id)
+    cloudinary.uploader.destroy(public_id, resource_type="image")
@@ -0,0 +1,289 @@
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.image_crud import get_image, register_image, image_urls
+from app.crud.post_crud import set_post_image
+from app.db.database import SessionLocal
+from app.models.image import Image
+from app.models.post import Post
+from app.utils.metrics import image_upload_seconds
+from app.utils.renditions import make_renditions, build_renditions_document
+from app.utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# posts.image_status values
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+# Staged files are "staged_<token>.ext" until a post claims them as
+# "<post_id>_<sha256>_<token>_<pid>.ext", pid being the worker process uploading it
+CLAIMED_NAME = re.compile(r"^(\d+)_([0-9a-f]{64})_([0-9a-f]+)(?:_(\d+))?(\.\w+)$")
+UNCLAIMED_MAX_AGE = 3600  # seconds before an unclaimed staged file counts as abandoned
+CLAIM_MAX_AGE = 3600  # seconds before a claimed file counts as abandoned even if its worker lives
+
+
+def new_staged_path(ext: str) -> str:
+    """A fresh, unclaimed path in the staging dir for an incoming upload."""
+    os.makedirs(settings.IMAGE_STAGING_DIR, exist_ok=True)
+    return os.path.join(settings.IMAGE_STAGING_DIR, f"staged_{uuid.uuid4().hex}{ext}")
+
+
+def discard_staged(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ImageUploader:
+    """
+    Background worker that moves staged images to storage.
+
+    Posts are saved with image_status="pending" as soon as the file is
+    staged. Images are content-addressed: if the same bytes were stored
+    before, the post reuses that copy straight away. Otherwise the worker
+    renders the resized variants, uploads them and the original with
+    exponential-backoff retries, registers the result in `images`, then
+    swaps it onto the post and sets image_status to "ready" (or "failed").
+    If a post gets a newer image while an older one is still uploading,
+    only the newest result is written.
+    """
+
+    def __init__(self, workers: int, max_attempts: int, retry_seconds: float):
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-upload")
+        self._latest: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, db: Session, db_post: Post, staged_path: str, sha256: str) -> Post:
+        """
+        Give a just-saved post its staged image: reuse a stored copy of the
+        same bytes, or queue an upload. If that fails the post is marked
+        "failed" and the staged file dropped before the error propagates.
+        """
+        try:
+            return self._attach(db, db_post, staged_path, sha256)
+        except Exception:
+            discard_staged(staged_path)
+            self._mark_failed(db_post.id)
+            raise
+
+    def _attach(self, db: Session, db_post: Post, staged_path: str, sha256: str) -> Post:
+        image = get_image(db, sha256)
+        if image is not None:
+            with self._lock:
+                # Supersedes any upload still running for this post
+                self._latest[db_post.id] = staged_path
+                try:
+                    stored = set_post_image(db, db_post.id, READY, image)
+                finally:
+                    del self._latest[db_post.id]
+            if stored:
+                discard_staged(staged_path)
+                db.refresh(db_post)
+                return db_post
+        # Never stored, or collected by gc_images since the lookup
+        self.submit(db_post.id, staged_path, sha256)
+        return db_post
+
+    def _mark_failed(self, post_id: int) -> None:
+        # Fresh session: the caller's may be the one that just failed
+        try:
+            with SessionLocal() as db:
+                set_post_image(db, post_id, FAILED)
+        except Exception:
+            logger.exception("Could not mark the image of post %s as failed", post_id)
+
+    def submit(self, post_id: int, staged_path: str, sha256: str) -> None:
+        """Claim a staged file for `post_id` and queue its upload."""
+        ext = os.path.splitext(staged_path)[1]
+        claimed = self._claimed_path(post_id, sha256, uuid.uuid4().hex, ext)
+        os.rename(staged_path, claimed)
+        self._enqueue(post_id, claimed, sha256)
+
+    @staticmethod
+    def _claimed_path(post_id: int, sha256: str, token: str, ext: str) -> str:
+        return os.path.join(settings.IMAGE_STAGING_DIR, f"{post_id}_{sha256}_{token}_{os.getpid()}{ext}")
+
+    def _enqueue(self, post_id: int, claimed: str, sha256: str) -> None:
+        with self._lock:
+            self._latest[post_id] = claimed
+        try:
+            self._executor.submit(self._process, post_id, claimed, sha256)
+        except Exception:
+            # Executor shut down; any older upload for the post stays superseded
+            with self._lock:
+                if self._latest.get(post_id) == claimed:
+                    del self._latest[post_id]
+            discard_staged(claimed)
+            raise
+
+    def _is_current(self, post_id: int, path: str) -> bool:
+        with self._lock:
+            return self._latest.get(post_id) == path
+
+    def _process(self, post_id: int, path: str, sha256: str) -> None:
+        with SessionLocal() as db:
+            # Another post may have stored the same bytes since this was queued
+            image = get_image(db, sha256)
+        if image is None:
+            try:
+                renditions = make_renditions(path)
+            except Exception:
+                # Undecodable by Pillow: still publish the original as uploaded
+                logger.warning("Could not render image variants for post %s", post_id, exc_info=True)
+                renditions = []
+            try:
+                result = self._upload_all(post_id, path, renditions)
+            finally:
+                for rendition in renditions:
+                    discard_staged(rendition[4])
+            if result is None:
+                discard_staged(path)
+                return
+            image_url, document = result
+            if image_url:
+                image = self._register(sha256, image_url, document)
+        self._finish(post_id, path, sha256, image)
+
+    def _upload_all(self, post_id: int, path: str, renditions: list) -> Optional[Tuple[Optional[str], Optional[dict]]]:
+        """
+        Upload the original and every rendition, retrying whatever is left.
+        Returns (image_url, renditions document), (None, None) if the
+        attempts ran out, or None if this upload was superseded.
+        """
+        urls: Dict[str, str] = {}
+        pending = [path] + [rendition[4] for rendition in renditions]
+        for attempt in range(1, self.max_attempts + 1):
+            if not self._is_current(post_id, path) or not os.path.exists(path):
+                # Superseded by a newer image (or taken over by another process)
+                return None
+            try:
+                for file_path in pending:
+                    if file_path not in urls:
+                        urls[file_path] = self._store(file_path)
+                document = None
+                if renditions:
+                    document = build_renditions_document(
+                        [(name, width, height, fmt, urls[file_path]) for name, width, height, fmt, file_path in renditions]
+                    )
+                return urls[path], document
+            except Exception:
+                logger.warning(
+                    "Image upload for post %s failed (attempt %d/%d)",
+                    post_id, attempt, self.max_attempts, exc_info=True,
+                )
+                if attempt < self.max_attempts:
+                    time.sleep(self.retry_seconds * 2 ** (attempt - 1))
+        return None, None
+
+    def _store(self, path: str) -> str:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            url = get_storage().upload(path, settings.CLOUDINARY_FOLDER)
+            outcome = "ok"
+            return url
+        finally:
+            image_upload_seconds.observe((settings.STORAGE_BACKEND, outcome), time.perf_counter() - started)
+
+    def _register(self, sha256: str, image_url: str, renditions: Optional[dict]) -> Optional[Image]:
+        try:
+            with SessionLocal() as db:
+                image = register_image(db, sha256, image_url, renditions)
+                if image.url != image_url:
+                    # Lost a race with an identical upload; keep theirs, drop ours
+                    for url in image_urls(image_url, renditions):
+                        get_storage().delete(url)
+                return image
+        except Exception:
+            logger.exception("Could not register uploaded image %s", sha256)
+            return None
+
+    def _finish(self, post_id: int, path: str, sha256: str, image: Optional[Image]) -> None:
+        with self._lock:
+            if self._latest.get(post_id) != path:
+                discard_staged(path)
+                return
+            try:
+                with SessionLocal() as db:
+                    # Without an image the post keeps whatever it had before
+                    stored = set_post_image(db, post_id, READY if image else FAILED, image)
+            except Exception:
+                # Leave the claimed file in place so resume() retries it after a restart
+                logger.exception("Could not record image upload for post %s", post_id)
+                del self._latest[post_id]
+                return
+            if not stored:
+                # gc_images deleted the image since it was looked up: upload it again
+                self._executor.submit(self._process, post_id, path, sha256)
+                return
+            del self._latest[post_id]
+        discard_staged(path)
+
+    def resume(self) -> int:
+        """Requeue uploads claimed before a restart and drop abandoned staged files."""
+        directory = settings.IMAGE_STAGING_DIR
+        if not os.path.isdir(directory):
+            return 0
+        resumed = 0
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            match = CLAIMED_NAME.match(name)
+            try:
+                if match:
+                    post_id, sha256, token, owner, ext = match.groups()
+                    if not self._abandoned(path, owner):
+                        continue  # a live worker is still uploading it
+                    # Only one process can win the rename; the others get FileNotFoundError
+                    claimed = self._claimed_path(int(post_id), sha256, token, ext)
+                    os.rename(path, claimed)
+                    os.utime(claimed)
+                    self._enqueue(int(post_id), claimed, sha256)
+                    resumed += 1
+                elif time.time() - os.path.getmtime(path) > UNCLAIMED_MAX_AGE:
+                    # Staged but never claimed, or renditions left by a crash
+                    discard_staged(path)
+            except FileNotFoundError:
+                pass  # taken over or finished by another process in the meantime
+        return resumed
+
+    @staticmethod
+    def _abandoned(path: str, owner: Optional[str]) -> bool:
+        """Whether no running worker is uploading this claimed file."""
+        if owner is None or int(owner) == os.getpid():
+            # Named before owners were recorded, or ours from before a restart
+            return True
+        if time.time() - os.path.getmtime(path) > CLAIM_MAX_AGE:
+            # Far past any retry schedule; the pid has likely been reused
+            return True
+        try:
+            os.kill(int(owner), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass  # alive, under another user
+        return False
+
+    def shutdown(self) -> None:
+        # Queued uploads stay on disk and are picked up by resume() next start
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+image_uploader = ImageUploader(
+    workers=settings.IMAGE_UPLOAD_WORKERS,
+    max_attempts=settings.IMAGE_UPLOAD_MAX_ATTEMPTS,
+    retry_seconds=settings.IMAGE_UPLOAD_RETRY_SECONDS,
+)
@@ -0,0 +1,249 @@
+"""
+In-process metrics in the Prometheus text format, without a client library.
+
+MetricsMiddleware times every request by route template (/posts/{post_id},
+not /posts/42, so the series stay bounded), counts the SQL statements each
+request sends and the time they take, and serves everything at /metrics
+together with the connection-pool occupancy of every engine, to scrapers
+that send METRICS_TOKEN as a bearer token. Recording is
+a few dict lookups and integer adds under an uncontended lock.
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.responses import Response
+
+from app.db.database import get_pool_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+UPLOAD_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Requests that matched no route (404s, static files) share one label
+UNMATCHED = "<unmatched>"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Fixed upper bounds; each series keeps one count per bucket plus a sum."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                label_text = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+request_seconds = Histogram(
+    "http_request_duration_seconds", "Time to handle a request, including its response body.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+request_statements = Histogram(
+    "http_request_sql_statements", "SQL statements sent while handling a request.",
+    ("method", "route"), STATEMENT_BUCKETS,
+)
+request_sql_seconds = Histogram(
+    "http_request_sql_duration_seconds", "Time a request spent waiting on SQL statements.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+image_upload_seconds = Histogram(
+    "image_upload_duration_seconds", "Time to store one image file (original or rendition).",
+    ("backend", "outcome"), UPLOAD_BUCKETS,
+)
+
+REGISTRY = [requests_total, request_seconds, request_statements, request_sql_seconds, image_upload_seconds]
+
+
+# -------- SQL statements per request -------- #
+class _RequestSQL:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Set by the middleware; the threadpool that runs sync routes copies the
+# context, so their statements land on the same object.
+_request_sql: ContextVar[Optional[_RequestSQL]] = ContextVar("request_sql", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_sql.get()
+    if stats is not None:
+        stats.statements += 1
+        # A connection runs one statement at a time, so one slot is enough
+        conn.info["metrics_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("metrics_started", None)
+    stats = _request_sql.get()
+    if started is not None and stats is not None:
+        stats.seconds += time.perf_counter() - started
+
+
+def instrument_engines() -> None:
+    """Listen on the Engine class, so replicas and the async engines are covered too."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# -------- Connection pools -------- #
+POOL_GAUGES = (
+    ("db_pool_size", "gauge", "size", "Connections the pool keeps open."),
+    ("db_pool_checked_out", "gauge", "checked_out", "Connections currently in use."),
+    ("db_pool_overflow", "gauge", "overflow", "Connections open beyond the pool size."),
+    ("db_pool_checkouts_total", "counter", "checkouts", "Successful connection checkouts."),
+    ("db_pool_timeouts_total", "counter", "timeouts", "Checkouts that gave up waiting for a connection."),
+    ("db_pool_wait_seconds_total", "counter", "wait_seconds_total", "Time spent waiting for a free connection."),
+)
+
+
+def _pool_lines() -> List[str]:
+    stats = get_pool_stats()
+    lines = []
+    for name, kind, key, documentation in POOL_GAUGES:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        for engine_name, status in sorted(stats.items()):
+            if key in status:
+                lines.append(f'{name}{{engine="{_escape(engine_name)}"}} {_format_value(status[key])}')
+    return lines
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines += metric.collect()
+    lines += _pool_lines()
+    return "\n".join(lines) + "\n"
+
+
+# -------- Middleware -------- #
+class MetricsMiddleware:
+    """Pure ASGI, so streaming responses pass through untouched and nothing is buffered."""
+
+    def __init__(self, app, token: Optional[str] = None, path: str = "/metrics"):
+        self.app = app
+        # Without a token the metrics are still collected but never served
+        self.authorization = f"Bearer {token}".encode() if token else None
+        self.path = path
+        instrument_engines()
+
+    def _authorized(self, scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                return hmac.compare_digest(value, self.authorization)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == self.path and self.authorization is not None:
+            if self._authorized(scope):
+                response = Response(render(), media_type=CONTENT_TYPE)
+            else:
+                response = Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+            await response(scope, receive, send)
+            return
+
+        status = 500  # unless the app gets as far as starting a response
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        sql = _RequestSQL()
+        token = _request_sql.set(sql)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_sql.reset(token)
+            # The router stores the matched route in the scope on the way in
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            labels = (scope["method"], route)
+            requests_total.inc((scope["method"], route, str(status)))
+            request_seconds.observe(labels, elapsed)
+            request_statements.observe(labels, sql.statements)
+            request_sql_seconds.observe(labels, sql.seconds)
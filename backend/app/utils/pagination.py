@@ -0,0 +1,39 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+from fastapi import HTTPException, status
+
+
+# -------- Keyset cursor helpers -------- #
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+    datetimes are stored as ISO strings; everything else must be JSON-safe.
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor, raising 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list):
+            raise ValueError("cursor payload must be a list")
+        return values
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def decode_datetime_cursor(cursor: str) -> tuple:
+    """Decode a (created_at, id) cursor."""
+    values = decode_cursor(cursor)
+    try:
+        created_at, row_id = values
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
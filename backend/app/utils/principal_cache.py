@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.utils.ttl_cache import TTLCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The slice of a User that authorization needs, cheap to cache and share."""
+    id: int
+    username: str
+    is_active: bool
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            is_active=bool(user.is_active),
+            is_admin=bool(user.is_admin),
+        )
+
+
+# Per process. Every path that changes is_active/is_admin/username or
+# deletes a user must call invalidate_principal so the change applies
+# on the user's next request in this process. Other workers keep their
+# copy until the TTL, which is why api.dependencies only serves plain
+# reads from here and re-reads the user for writes and admin requests.
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_MAXSIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def get_cached_principal(user_id: int) -> Optional[Principal]:
+    return principal_cache.get((user_id,))
+
+
+def cache_principal(user) -> Principal:
+    principal = Principal.from_user(user)
+    principal_cache.set((user.id,), principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.invalidate((user_id,))
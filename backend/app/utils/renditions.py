@@ -0,0 +1,90 @@
+import os
+import uuid
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from app.core.config import settings
+
+# Pillow is imported on first use: it is slow to import and only the
+# image upload workers ever need it.
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Name -> maximum width in pixels. Images are never upscaled; sizes that
+# would come out identical share one set of files.
+RENDITION_WIDTHS = {"thumb": 320, "card": 800, "full": 1600}
+
+# Pillow format name -> (key used in the API, file extension, save options)
+FORMATS = {
+    "WEBP": ("webp", ".webp", {"quality": 80, "method": 4}),
+    "AVIF": ("avif", ".avif", {"quality": 60}),
+    "JPEG": ("jpeg", ".jpg", {"quality": 85, "optimize": True, "progressive": True}),
+    "PNG": ("png", ".png", {"optimize": True}),
+    "GIF": ("gif", ".gif", {}),
+}
+
+
+def rendition_formats(original_format: str) -> List[str]:
+    """Modern formats first, then the upload's own format as the fallback."""
+    from PIL import features
+
+    formats = ["WEBP"]
+    if settings.IMAGE_RENDITIONS_AVIF and features.check("avif"):
+        formats.append("AVIF")
+    if original_format in FORMATS and original_format not in formats:
+        formats.append(original_format)
+    return formats
+
+
+def _save(image: "Image.Image", fmt: str, directory: str) -> str:
+    _, ext, options = FORMATS[fmt]
+    if fmt == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    path = os.path.join(directory, f"rendition_{uuid.uuid4().hex}{ext}")
+    image.save(path, fmt, **options)
+    return path
+
+
+def make_renditions(path: str) -> List[Tuple[str, int, int, str, str]]:
+    """
+    Resize the image at `path` to each RENDITION_WIDTHS size and encode it
+    in every rendition format. Files are written next to `path`; returns
+    (name, width, height, format key, file path) tuples; names that share a
+    width share a file path. Animated images are left alone and produce no
+    renditions.
+    """
+    from PIL import Image, ImageOps
+
+    directory = os.path.dirname(path)
+    produced = []
+    with Image.open(path) as original:
+        if getattr(original, "is_animated", False):
+            return []
+        formats = rendition_formats(original.format)
+        image = ImageOps.exif_transpose(original)
+        if image.mode == "P":
+            image = image.convert("RGBA")
+        by_width: Dict[int, List[Tuple[int, str, str]]] = {}
+        for name, max_width in sorted(RENDITION_WIDTHS.items(), key=lambda item: item[1]):
+            width = min(max_width, image.width)
+            if width not in by_width:
+                height = max(1, round(image.height * width / image.width))
+                resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                by_width[width] = [(height, FORMATS[fmt][0], _save(resized, fmt, directory)) for fmt in formats]
+            produced.extend((name, width, height, key, file_path) for height, key, file_path in by_width[width])
+    return produced
+
+
+def build_renditions_document(uploaded: List[Tuple[str, int, int, str, str]]) -> Dict:
+    """
+    Shape uploaded renditions (as returned by make_renditions, with URLs in
+    place of file paths) for posts.image_renditions / PostResponse.
+    """
+    sizes: Dict[str, Dict] = {}
+    srcset: Dict[str, List[str]] = {}
+    for name, width, height, fmt, url in uploaded:
+        size = sizes.setdefault(name, {"width": width, "height": height, "urls": {}})
+        size["urls"][fmt] = url
+        entry = f"{url} {width}w"
+        if entry not in srcset.setdefault(fmt, []):
+            srcset[fmt].append(entry)
+    return {"sizes": sizes, "srcset": {fmt: ", ".join(entries) for fmt, entries in srcset.items()}}
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from app.core.config import settings
+from app.utils.ttl_cache import TTLCache
+
+# -------------------------------------------------------------------
+# Serialized-response cache for anonymous list reads
+# -------------------------------------------------------------------
+# Holds the JSON bytes of GET /posts/ and GET /comments/{post_id} pages as
+# seen by anonymous visitors. Post and comment writes invalidate the
+# affected entries; like/view counters are allowed to lag by up to the TTL.
+# The cache is per process, so other workers only catch up on expiry.
+response_cache = TTLCache(maxsize=settings.RESPONSE_CACHE_MAXSIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+FEED = "feed"
+COMMENTS = "comments"
+
+
+def feed_key(skip: int, limit: int, cursor: Optional[str]) -> tuple:
+    # skip is ignored when paging by cursor, so it must not split the key
+    return (FEED, cursor, 0 if cursor else skip, limit)
+
+
+def comments_key(post_id: int, skip: int, limit: int, cursor: Optional[str] = None, replies: int = 0) -> tuple:
+    return (COMMENTS, post_id, cursor, 0 if cursor else skip, limit, replies)
+
+
+def invalidate_feed() -> None:
+    response_cache.invalidate_prefix(FEED)
+
+
+def invalidate_comments(post_id: int) -> None:
+    response_cache.invalidate_prefix(COMMENTS, post_id)
+
+
+def invalidate_post(post_id: int) -> None:
+    """A post changed visibility or was deleted: its feed pages and comment pages go stale."""
+    invalidate_feed()
+    invalidate_comments(post_id)
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -8,7 +8,14 @@ from fastapi.security import OAuth2PasswordBearer
 
 oauth2_refresh_scheme = OAuth2PasswordBearer(tokenUrl="/auth/refresh")
 # -------- Password hashing context -------- #
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min == max == default, so needs_update() flags hashes made with any other cost
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 # -------- Password utilities -------- #
 def get_password_hash(password: str) -> str:
@@ -19,6 +26,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify the given plain password against the hashed one."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses outdated settings, return a fresh one.
+    Returns (valid, new_hash); new_hash is None when no rehash is needed.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 # -------- JWT Token utilities -------- #
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -55,10 +69,6 @@ def get_token_expiry_time(token: str) -> Optional[datetime]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         exp_timestamp = payload.get("exp")
-        print("TOKEN RECEIVED:", token)
         return datetime.utcfromtimestamp(exp_timestamp) if exp_timestamp else None
-        
-
     except JWTError:
-        print("jwt error")
         return None
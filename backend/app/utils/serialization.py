@@ -0,0 +1,30 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class ResponseSerializer:
+    """
+    Precompiled ORM-to-JSON path for a response model.
+
+    Returning ORM objects with a response_model makes FastAPI validate them,
+    dump the result to Python dicts and encode those again. Here the objects
+    are read by attribute once and pydantic-core writes the JSON bytes
+    directly. Routes return the Response as-is, so FastAPI skips its own
+    validation; keep response_model on the route for the OpenAPI schema.
+    """
+
+    def __init__(self, model: Any):
+        self.adapter = TypeAdapter(model)
+
+    def to_json(self, value: Any) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(value, from_attributes=True))
+
+    def response(self, value: Any, status_code: int = 200) -> Response:
+        return json_response(self.to_json(value), status_code)
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    """Wrap already-encoded JSON (e.g. from the response cache)."""
+    return Response(content=body, status_code=status_code, media_type="application/json")
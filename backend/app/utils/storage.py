@@ -0,0 +1,69 @@
+import os
+import shutil
+import uuid
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from app.core.config import settings
+
+
+class StorageBackend(ABC):
+    """Where finished images end up. Selected by settings.STORAGE_BACKEND."""
+
+    @abstractmethod
+    def upload(self, path: str, folder: str) -> str:
+        """Store the file at `path` under `folder` and return its public URL."""
+
+    @abstractmethod
+    def delete(self, url: str) -> None:
+        """Remove a file previously returned by upload(); a missing file is not an error."""
+
+
+class CloudinaryStorage(StorageBackend):
+    def __init__(self):
+        # Imported here so the local backend works without the SDK or credentials
+        from app.utils.cloudinary_service import configure_cloudinary
+        configure_cloudinary()
+
+    def upload(self, path: str, folder: str) -> str:
+        from app.utils.cloudinary_service import upload_to_cloudinary
+        return upload_to_cloudinary(path, folder=folder)
+
+    def delete(self, url: str) -> None:
+        from app.utils.cloudinary_service import delete_from_cloudinary
+        delete_from_cloudinary(url)
+
+
+class LocalStorage(StorageBackend):
+    """Copies images under LOCAL_STORAGE_DIR, served at LOCAL_STORAGE_URL. For dev and offline runs."""
+
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def upload(self, path: str, folder: str) -> str:
+        name = uuid.uuid4().hex + os.path.splitext(path)[1]
+        os.makedirs(os.path.join(self.root, folder), exist_ok=True)
+        # copyfile streams in chunks rather than reading the image into memory
+        shutil.copyfile(path, os.path.join(self.root, folder, name))
+        return f"{self.base_url}/{folder}/{name}"
+
+    def delete(self, url: str) -> None:
+        if not url.startswith(self.base_url + "/"):
+            raise ValueError(f"Not a local storage URL: {url}")
+        relative = os.path.normpath(url[len(self.base_url) + 1:])
+        if relative.startswith("..") or os.path.isabs(relative):
+            raise ValueError(f"Not a local storage URL: {url}")
+        try:
+            os.remove(os.path.join(self.root, relative))
+        except FileNotFoundError:
+            pass
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.LOCAL_STORAGE_DIR, settings.LOCAL_STORAGE_URL)
+    if settings.STORAGE_BACKEND == "cloudinary":
+        return CloudinaryStorage()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND!r}")
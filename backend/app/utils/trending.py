@@ -0,0 +1,18 @@
+import asyncio
+import logging
+
+from app.crud.trending_crud import refresh_trending
+
+logger = logging.getLogger(__name__)
+
+
+async def run_trending_refresh(engine, interval: float) -> None:
+    """Refresh post_scores every `interval` seconds, off the event loop."""
+    while True:
+        try:
+            scored = await asyncio.to_thread(refresh_trending, engine)
+            if scored is not None:
+                logger.info("Trending scores refreshed for %d posts", scored)
+        except Exception:
+            logger.exception("Trending refresh failed; retrying next interval")
+        await asyncio.sleep(interval)
@@ -0,0 +1,198 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request, status
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.utils.image_pipeline import new_staged_path, discard_staged
+
+ALLOWED_TYPES = {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif"}
+MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
+MAX_FIELD_SIZE = 64 * 1024  # title/content
+FORM_OVERHEAD = 16 * 1024  # boundaries and part headers
+
+# Leading bytes of each allowed type; the declared content type must agree
+MAGIC_BYTES = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+}
+SNIFF_LENGTH = 8
+
+# Request body documentation for routes that read the form with stream_post_form
+POST_FORM_OPENAPI = {
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "content": {"type": "string"},
+                        "image": {"type": "string", "format": "binary"},
+                    },
+                }
+            }
+        }
+    }
+}
+
+
+def _bad_request(detail: str, code: int = status.HTTP_400_BAD_REQUEST) -> HTTPException:
+    return HTTPException(status_code=code, detail=detail)
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    for magic, content_type in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return content_type
+    return None
+
+
+@dataclass
+class StreamedForm:
+    """Text fields of a multipart form, plus the image if one was sent (already staged on disk)."""
+    fields: Dict[str, str] = field(default_factory=dict)
+    image_path: Optional[str] = None
+    image_sha256: Optional[str] = None
+
+    def discard(self) -> None:
+        if self.image_path:
+            discard_staged(self.image_path)
+            self.image_path = None
+
+
+class _ImagePart:
+    """Writes one file part to the staging dir, validating it as the bytes arrive."""
+
+    def __init__(self, declared_type: str, max_size: int):
+        if declared_type not in ALLOWED_TYPES:
+            raise _bad_request("Invalid file type. Only JPEG, PNG, and GIF are allowed.")
+        self.declared_type = declared_type
+        self.max_size = max_size
+        self.size = 0
+        self.head = b""
+        self.sha256 = hashlib.sha256()
+        self.path = new_staged_path(ALLOWED_TYPES[declared_type])
+        self.file = open(self.path, "wb")
+
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise _bad_request("File size exceeds 5MB limit.", status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if len(self.head) < SNIFF_LENGTH:
+            self.head += data[: SNIFF_LENGTH - len(self.head)]
+            if len(self.head) >= SNIFF_LENGTH:
+                self._check_type()
+        self.sha256.update(data)
+        self.file.write(data)
+
+    def _check_type(self) -> None:
+        if sniff_image_type(self.head) != self.declared_type:
+            raise _bad_request("File content does not match its declared image type.")
+
+    def finish(self) -> Optional[str]:
+        """Close the file; returns its path, or None if the part was empty."""
+        self.file.close()
+        if self.size == 0:
+            discard_staged(self.path)
+            return None
+        if len(self.head) < SNIFF_LENGTH:
+            self._check_type()
+        return self.path
+
+    def abort(self) -> None:
+        self.file.close()
+        discard_staged(self.path)
+
+
+async def stream_post_form(request: Request, file_field: str = "image", max_size: int = MAX_IMAGE_SIZE) -> StreamedForm:
+    """
+    Read a multipart form straight off the request stream.
+
+    Unlike UploadFile, which spools the whole body before the route runs,
+    the image is written to the staging dir chunk by chunk, and the size
+    cap and magic-byte check apply as it arrives: an oversized or
+    mislabeled file is rejected without reading the rest of it.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type == b"application/x-www-form-urlencoded":
+        # No file can be sent this way; the body is just the text fields
+        async with request.form(max_part_size=MAX_FIELD_SIZE) as data:
+            return StreamedForm(fields={key: value for key, value in data.items() if isinstance(value, str)})
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise _bad_request("Expected a multipart/form-data body.", status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + 2 * MAX_FIELD_SIZE + FORM_OVERHEAD:
+        raise _bad_request("File size exceeds 5MB limit.", status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    form = StreamedForm()
+    state = {"headers": {}, "header_field": b"", "header_value": b"", "name": None, "value": [], "image": None}
+
+    def on_part_begin():
+        state.update(headers={}, header_field=b"", header_value=b"", name=None, value=[], image=None)
+
+    def on_header_field(data, start, end):
+        state["header_field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["header_value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["header_field"].lower()] = state["header_value"]
+        state["header_field"] = state["header_value"] = b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        name = disposition.get(b"name", b"").decode()
+        state["name"] = name
+        if b"filename" in disposition:
+            if name != file_field or form.image_path:
+                raise _bad_request(f"Unexpected file field: {name}")
+            part_type = state["headers"].get(b"content-type", b"").decode().lower()
+            state["image"] = _ImagePart(part_type, max_size)
+
+    def on_part_data(data, start, end):
+        image = state["image"]
+        if image is not None:
+            image.write(data[start:end])
+        else:
+            state["value"].append(data[start:end])
+            if sum(len(chunk) for chunk in state["value"]) > MAX_FIELD_SIZE:
+                raise _bad_request(f"Field too large: {state['name']}", status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def on_part_end():
+        image = state["image"]
+        if image is not None:
+            state["image"] = None
+            form.image_path = image.finish()
+            form.image_sha256 = image.sha256.hexdigest() if form.image_path else None
+        elif state["name"]:
+            form.fields[state["name"]] = b"".join(state["value"]).decode("utf-8", errors="replace")
+
+    parser = MultipartParser(
+        params[b"boundary"],
+        callbacks={
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        },
+    )
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except Exception as exc:
+        if state["image"] is not None:
+            state["image"].abort()
+        form.discard()
+        if isinstance(exc, HTTPException):
+            raise
+        raise _bad_request("Malformed multipart body.") from exc
+    return form
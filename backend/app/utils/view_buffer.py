@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import threading
+from collections import Counter
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import Integer, bindparam, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.models.post import Post
+from app.models.user import User
+from app.models.view import View
+
+logger = logging.getLogger(__name__)
+
+# Two bind parameters per pair; asyncpg allows 32767 per statement
+FLUSH_CHUNK = 10_000
+
+
+class ViewBuffer:
+    """
+    Write-behind buffer for post views.
+
+    Reads only record (post_id, user_id) pairs in memory; a background loop
+    flushes them in INSERT ... ON CONFLICT DO NOTHING statements of up to
+    FLUSH_CHUNK pairs into `views`, plus one relative view_count UPDATE per
+    post that gained new viewers. The buffer holds at most `max_pending`
+    pairs; while it is full (e.g. the database is down) new views are dropped.
+    """
+
+    def __init__(self, max_pending: int = 5000):
+        self.max_pending = max_pending
+        self._pending: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.dropped = 0
+
+    def record(self, post_id: int, user_id: int) -> None:
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                if (post_id, user_id) not in self._pending:
+                    self.dropped += 1
+                return
+            self._pending.add((post_id, user_id))
+            # Wake the flush once, when this view fills the buffer
+            full = len(self._pending) == self.max_pending
+        if full and self._loop is not None:
+            # May be called from a threadpool worker, so hop onto the loop
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def is_pending(self, post_id: int, user_id: int) -> bool:
+        with self._lock:
+            return (post_id, user_id) in self._pending
+
+    def _drain(self) -> Set[Tuple[int, int]]:
+        with self._lock:
+            events, self._pending = self._pending, set()
+        return events
+
+    def _requeue(self, events: List[Tuple[int, int]]) -> None:
+        with self._lock:
+            room = self.max_pending - len(self._pending)
+            kept = events[:max(room, 0)]
+            self._pending.update(kept)
+            self.dropped += len(events) - len(kept)
+
+    async def flush(self, engine) -> int:
+        """Write buffered views with `engine` (an AsyncEngine); returns new view rows."""
+        events = list(self._drain())
+        written = done = 0
+        try:
+            for start in range(0, len(events), FLUSH_CHUNK):
+                chunk = events[start:start + FLUSH_CHUNK]
+                written += await self._write(engine, chunk)
+                done = start + len(chunk)
+        except Exception:
+            logger.exception("Failed to flush %d buffered views; will retry", len(events) - done)
+        finally:
+            # Also on cancellation; rewriting a chunk that did commit is harmless
+            # because the INSERT skips existing views
+            if done < len(events):
+                self._requeue(events[done:])
+        return written
+
+    async def _write(self, engine, events: List[Tuple[int, int]]) -> int:
+        batch = values(column("user_id", Integer), column("post_id", Integer), name="batch").data(
+            [(user_id, post_id) for post_id, user_id in events]
+        )
+        # Joining posts/users drops views for rows deleted since they were buffered
+        insert_views = (
+            pg_insert(View)
+            .from_select(
+                ["user_id", "post_id"],
+                select(batch.c.user_id, batch.c.post_id)
+                .join(Post, Post.id == batch.c.post_id)
+                .join(User, User.id == batch.c.user_id),
+            )
+            .on_conflict_do_nothing()
+            .returning(View.post_id)
+        )
+        posts = Post.__table__
+        bump_counts = (
+            update(posts)
+            .where(posts.c.id == bindparam("b_post_id"))
+            # A view is not an edit: keep updated_at out of the onupdate hook
+            .values(view_count=func.coalesce(posts.c.view_count, 0) + bindparam("b_views"), updated_at=posts.c.updated_at)
+        )
+        async with engine.begin() as conn:
+            inserted = Counter((await conn.execute(insert_views)).scalars().all())
+            if inserted:
+                await conn.execute(
+                    bump_counts,
+                    [{"b_post_id": post_id, "b_views": n} for post_id, n in inserted.items()],
+                )
+        return sum(inserted.values())
+
+    async def run(self, engine, interval: float) -> None:
+        """Flush every `interval` seconds, or sooner when the buffer fills up."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush(engine)
+
+
+view_buffer = ViewBuffer(max_pending=settings.VIEW_BUFFER_MAX_PENDING)
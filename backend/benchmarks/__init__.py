@@ -0,0 +1,4 @@
+"""Load and latency scripts run against a live server; not part of the app."""
+
+# Password of every user created by benchmarks.seed
+PASSWORD = "benchmark-pass"
@@ -0,0 +1,51 @@
+"""Save scenario reports as a baseline and compare later runs against it."""
+import json
+from typing import Dict, List, Tuple
+
+# Lower is better for latencies, higher for throughput
+METRICS = (("p50_ms", 1), ("p95_ms", 1), ("p99_ms", 1), ("rps", -1))
+
+
+def save_baseline(path: str, report: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, report: dict, tolerance: float) -> Tuple[List[dict], bool]:
+    """
+    Per-scenario change of each metric, as a fraction of the baseline.
+    Returns the rows and whether any metric got worse by more than `tolerance`.
+    """
+    rows = []
+    regressed = False
+    before: Dict[str, dict] = baseline.get("scenarios", {})
+    for name, after in report["scenarios"].items():
+        if name not in before:
+            continue
+        for metric, direction in METRICS:
+            old, new = before[name].get(metric), after.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change * direction > tolerance
+            regressed = regressed or worse
+            rows.append({"scenario": name, "metric": metric, "baseline": old, "current": new,
+                         "change": change, "regressed": worse})
+    return rows, regressed
+
+
+def format_comparison(rows: List[dict]) -> str:
+    lines = [f"{'scenario':<12} {'metric':<8} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        lines.append(
+            f"{row['scenario']:<12} {row['metric']:<8} {row['baseline']:>10} {row['current']:>10} "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
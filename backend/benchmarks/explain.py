@@ -0,0 +1,246 @@
+"""
+EXPLAIN every statement the sync CRUD modules issue, against a seeded database.
+
+Each case calls a post_crud, comment_crud, user_crud or admin_crud function
+inside a transaction that is rolled back afterwards, records the SQL it
+sent, and runs EXPLAIN (FORMAT JSON) on each statement. A case fails when
+the call raises (its remaining statements went unchecked), when a plan
+sequentially scans a table holding more than --min-rows rows, or
+when a plan's estimated cost exceeds --max-cost or grows more than
+--cost-factor times over a saved cost file. Foreign keys with no index
+leading on their columns are reported too: the checks Postgres runs on
+every delete of the referenced row would scan the whole referencing table.
+
+    python -m benchmarks.seed --reset
+    python -m benchmarks.explain --save-costs plan_costs.json
+    python -m benchmarks.explain --costs plan_costs.json
+
+The exit status is 1 when anything was reported.
+"""
+import argparse
+import sys
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud import admin_crud, comment_crud, post_crud, user_crud
+from app.db.database import engine
+from app.models.comment import Comment
+from app.models.post import Post
+from app.models.user import User
+from app.schemas.comment_schema import CommentCreate, CommentUpdate
+from app.schemas.post_schema import PostCreate, PostUpdate
+from app.schemas.user_schema import UserCreate, UserUpdate
+from benchmarks.baseline import load_baseline, save_baseline
+
+SCHEMA = "boom_blog"
+# Transaction plumbing and session setup, not CRUD statements
+SKIPPED = ("SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN", "COMMIT", "SET ", "SHOW ", "SELECT PG_")
+
+Case = Callable[[Session, dict], object]
+
+
+def _first_cursor(db: Session, ids: dict) -> str:
+    return post_crud.get_all_posts(db, limit=6)[1]
+
+
+CASES: Dict[str, Case] = {
+    "post_crud.get_all_posts": lambda db, ids: post_crud.get_all_posts(db, limit=6),
+    "post_crud.get_all_posts/deep_offset": lambda db, ids: post_crud.get_all_posts(db, skip=10_000, limit=6),
+    "post_crud.get_all_posts/cursor_user": lambda db, ids: post_crud.get_all_posts(
+        db, limit=6, cursor=_first_cursor(db, ids), user_id=ids["user"]
+    ),
+    "post_crud.get_all_posts/admin": lambda db, ids: post_crud.get_all_posts(db, limit=6, is_admin=True),
+    "post_crud.search_posts": lambda db, ids: post_crud.search_posts(db, "postgres index", limit=10),
+    "post_crud.get_post_by_id": lambda db, ids: post_crud.get_post_by_id(db, ids["post"], user_id=ids["user"]),
+    "post_crud.create_post": lambda db, ids: post_crud.create_post(
+        db, PostCreate(title="explain", content="explain harness"), ids["user"]
+    ),
+    "post_crud.update_post": lambda db, ids: post_crud.update_post(
+        db, db.get(Post, ids["post"]), PostUpdate(title="explain")
+    ),
+    "post_crud.set_post_image": lambda db, ids: post_crud.set_post_image(db, ids["post"], "ready"),
+    "post_crud.toggle_like": lambda db, ids: post_crud.toggle_like(db, ids["post"], ids["user"]),
+    "post_crud.toggle_post_active": lambda db, ids: post_crud.toggle_post_active(db, ids["post"]),
+    "post_crud.delete_post": lambda db, ids: post_crud.delete_post(db, db.get(Post, ids["post"])),
+    "comment_crud.create_comment": lambda db, ids: comment_crud.create_comment(
+        db, CommentCreate(content="explain"), ids["user"], ids["post"]
+    ),
+    "comment_crud.create_comment/reply": lambda db, ids: comment_crud.create_comment(
+        db, CommentCreate(content="explain", parent_id=ids["root"]), ids["user"], ids["post"]
+    ),
+    "comment_crud.get_comments_by_post": lambda db, ids: comment_crud.get_comments_by_post(db, ids["post"]),
+    "comment_crud.get_comments_by_post/cursor": lambda db, ids: comment_crud.get_comments_by_post(
+        db, ids["post"], cursor=comment_crud.get_comments_by_post(db, ids["post"])[2]
+    ),
+    "comment_crud.get_thread": lambda db, ids: comment_crud.get_thread(db, ids["reply"]),
+    "comment_crud.update_comment": lambda db, ids: comment_crud.update_comment(
+        db, db.get(Comment, ids["reply"]), CommentUpdate(content="explain")
+    ),
+    "comment_crud.approve_comment": lambda db, ids: comment_crud.approve_comment(db, db.get(Comment, ids["reply"])),
+    "comment_crud.toggle_comment_approval": lambda db, ids: comment_crud.toggle_comment_approval(
+        db, db.get(Comment, ids["reply"])
+    ),
+    "comment_crud.delete_comment": lambda db, ids: comment_crud.delete_comment(db, db.get(Comment, ids["root"])),
+    "user_crud.get_user_by_id": lambda db, ids: user_crud.get_user_by_id(db, ids["user"]),
+    "user_crud.get_user_by_email": lambda db, ids: user_crud.get_user_by_email(db, ids["email"]),
+    "user_crud.get_all_users": lambda db, ids: user_crud.get_all_users(db, skip=100, limit=100),
+    "user_crud.create_user": lambda db, ids: user_crud.create_user(
+        db, UserCreate(email="explain@bench.example", password="explain-pass")
+    ),
+    "user_crud.update_user": lambda db, ids: user_crud.update_user(
+        db, db.get(User, ids["user"]), UserUpdate(username="explain")
+    ),
+    "user_crud.delete_user": lambda db, ids: user_crud.delete_user(db, db.get(User, ids["user"])),
+    "admin_crud.toggle_user_status": lambda db, ids: admin_crud.toggle_user_status(db, ids["user"]),
+    "admin_crud.toggle_post_active": lambda db, ids: admin_crud.toggle_post_active(db, ids["post"]),
+}
+
+
+class StatementRecorder:
+    """Collects the SQL an engine sends while `recording` is set."""
+
+    def __init__(self, engine):
+        self.recording = False
+        self.statements: List[Tuple[str, object]] = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.recording and not statement.lstrip().upper().startswith(SKIPPED):
+            self.statements.append((statement, parameters[0] if executemany else parameters))
+
+
+def _pick_ids(conn) -> dict:
+    """The busiest rows, so plans see the worst-case row estimates."""
+    def scalar(sql: str):
+        return conn.exec_driver_sql(sql).scalar()
+
+    root, post = conn.exec_driver_sql(
+        f"SELECT c.id, c.post_id FROM {SCHEMA}.comments c JOIN {SCHEMA}.posts p ON p.id = c.post_id "
+        "WHERE p.is_active AND c.parent_id IS NULL AND c.is_approved ORDER BY c.reply_count DESC LIMIT 1"
+    ).first() or (None, None)
+    reply = scalar(f"SELECT id FROM {SCHEMA}.comments WHERE root_id = {int(root)} LIMIT 1") if root else None
+    user = scalar(f"SELECT author_id FROM {SCHEMA}.posts GROUP BY author_id ORDER BY count(*) DESC LIMIT 1")
+    if not (reply and user):
+        raise SystemExit("Seed the database first (python -m benchmarks.seed --reset).")
+    email = scalar(f"SELECT email FROM {SCHEMA}.users WHERE id = {int(user)}")
+    return {"post": post, "root": root, "reply": reply, "user": user, "email": email}
+
+
+def _table_rows(conn) -> Dict[str, float]:
+    return dict(conn.exec_driver_sql(
+        "SELECT c.relname, c.reltuples FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        f"WHERE n.nspname = '{SCHEMA}' AND c.relkind = 'r'"
+    ).all())
+
+
+def unindexed_foreign_keys(conn) -> List[str]:
+    """Foreign keys whose columns are not the leading columns of any full index."""
+    rows = conn.exec_driver_sql(f"""
+        SELECT c.conrelid::regclass::text, c.conname
+        FROM pg_constraint c
+        WHERE c.contype = 'f'
+          AND c.connamespace = '{SCHEMA}'::regnamespace
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_index i
+              WHERE i.indrelid = c.conrelid
+                AND i.indpred IS NULL
+                AND (i.indkey::int2[])[0:cardinality(c.conkey) - 1] @> c.conkey
+          )
+        ORDER BY 1, 2
+    """).all()
+    return [f"{table}: foreign key {name} has no index" for table, name in rows]
+
+
+def _walk(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def plan_issues(plan: dict, table_rows: Dict[str, float], min_rows: int) -> List[str]:
+    issues = []
+    for node in _walk(plan["Plan"]):
+        relation = node.get("Relation Name")
+        if node["Node Type"] == "Seq Scan" and table_rows.get(relation, 0) >= min_rows:
+            issues.append(f"Seq Scan on {relation} (~{int(table_rows[relation])} rows)")
+    return issues
+
+
+def run_case(case: Case, ids: dict, recorder: StatementRecorder) -> Tuple[List[Tuple[str, object]], Optional[str]]:
+    """Run a CRUD call in a rolled-back transaction; returns its statements and any error."""
+    error = None
+    with engine.connect() as conn:
+        outer = conn.begin()
+        # The CRUD functions commit; with savepoints those commits stay inside `outer`
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        recorder.statements = []
+        recorder.recording = True
+        try:
+            case(db, ids)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {str(exc).splitlines()[0] if str(exc) else ''}"
+        finally:
+            recorder.recording = False
+            db.close()
+            outer.rollback()
+    return recorder.statements, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-rows", type=int, default=10_000, help="sequential scans of smaller tables are fine")
+    parser.add_argument("--max-cost", type=float, help="fail any plan estimated above this cost")
+    parser.add_argument("--costs", metavar="PATH", help="compare plan costs against a saved cost file")
+    parser.add_argument("--cost-factor", type=float, default=10.0, help="allowed growth over the saved cost")
+    parser.add_argument("--save-costs", metavar="PATH", help="write this run's plan costs")
+    parser.add_argument("--case", action="append", help="only run cases starting with this name")
+    args = parser.parse_args()
+
+    saved = load_baseline(args.costs) if args.costs else {}
+    recorder = StatementRecorder(engine)
+    costs: Dict[str, float] = {}
+    failures = 0
+    with engine.connect() as explain_conn:
+        ids = _pick_ids(explain_conn)
+        table_rows = _table_rows(explain_conn)
+        for issue in unindexed_foreign_keys(explain_conn):
+            table = issue.split(":")[0].split(".")[-1]
+            if table_rows.get(table, 0) >= args.min_rows:
+                print(f"FAIL schema: {issue}")
+                failures += 1
+
+        for name, case in CASES.items():
+            if args.case and not any(name.startswith(prefix) for prefix in args.case):
+                continue
+            statements, error = run_case(case, ids, recorder)
+            issues = []
+            for index, (statement, parameters) in enumerate(statements):
+                plan = explain_conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]
+                cost = plan["Plan"]["Total Cost"]
+                key = f"{name}#{index}"
+                costs[key] = cost
+                found = plan_issues(plan, table_rows, args.min_rows)
+                if args.max_cost is not None and cost > args.max_cost:
+                    found.append(f"cost {cost:.0f} > {args.max_cost:.0f}")
+                if saved.get(key) and cost > saved[key] * args.cost_factor:
+                    found.append(f"cost {cost:.0f} is {cost / saved[key]:.1f}x the saved {saved[key]:.0f}")
+                issues += [f"{issue}\n      {' '.join(statement.split())[:200]}" for issue in found]
+            # A case that raised stopped early, so its later statements were never checked
+            status = "FAIL" if issues or error else "ok"
+            note = f" (raised {error})" if error else ""
+            print(f"{status:<4} {name}: {len(statements)} statements{note}")
+            for issue in issues:
+                print(f"     - {issue}")
+            failures += bool(issues or error)
+        explain_conn.rollback()
+
+    if args.save_costs:
+        save_baseline(args.save_costs, costs)
+    print(f"{failures} failing" if failures else "All plans use indexes.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
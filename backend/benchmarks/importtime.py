@@ -0,0 +1,83 @@
+"""
+Import-time budget for the app, measured with `python -X importtime`.
+
+Imports app.main in a fresh interpreter and fails (exit status 1) when the
+cumulative import time goes over --budget-ms, when a module that should
+only load on first use (Pillow, the Cloudinary SDK) shows up, or when the
+import opens a network connection. The slowest modules are listed so a
+regression can be traced to whatever pulled them in.
+
+    python -m benchmarks.importtime --budget-ms 1500
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Only the workers that resize or store an image need these
+LAZY_MODULES = ("PIL", "cloudinary")
+
+# Any connection attempt during import is a bug: fail loudly instead of connecting
+PROBE = """
+import socket
+def _refuse(*args, **kwargs):
+    raise RuntimeError("network connection attempted at import time")
+socket.socket.connect = _refuse
+socket.create_connection = _refuse
+import app.main
+"""
+
+
+def measure(runs: int) -> Tuple[float, Dict[str, float]]:
+    """Best-of-`runs` total import time and per-module self times, in milliseconds."""
+    best_total, best_modules = None, {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE],
+            capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        if result.returncode != 0:
+            tail = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+            raise SystemExit("Importing app.main failed:\n" + "\n".join(tail[-15:]))
+        modules: Dict[str, float] = {}
+        total = 0.0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = int(self_us) / 1000
+            # Top-level imports are the only lines without indentation
+            if not name.startswith("  "):
+                total += int(cumulative_us) / 1000
+        if best_total is None or total < best_total:
+            best_total, best_modules = total, modules
+    return best_total, best_modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--runs", type=int, default=3, help="report the fastest of this many imports")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    args = parser.parse_args()
+
+    total, modules = measure(args.runs)
+    print(f"import app.main: {total:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, ms in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:8.1f} ms  {name.strip()}")
+
+    problems: List[str] = []
+    if total > args.budget_ms:
+        problems.append(f"import took {total:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    for lazy in LAZY_MODULES:
+        loaded = sorted(name.strip() for name in modules if name.strip().split(".")[0] == lazy)
+        if loaded:
+            problems.append(f"{lazy} is imported at startup ({', '.join(loaded[:3])})")
+    for problem in problems:
+        print(f"FAIL {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
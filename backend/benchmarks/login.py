@@ -0,0 +1,82 @@
+"""
+Login latency under concurrent load.
+
+Fires --logins sign-ins (half new registrations, half repeat logins) with
+--concurrency in flight, while a second group of clients reads the feed,
+so you can see whether bcrypt work still slows down unrelated reads.
+
+    python -m benchmarks.login --base-url http://localhost:8000 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+import httpx
+
+from benchmarks.stats import percentiles
+
+
+async def _login_worker(client: httpx.AsyncClient, queue: asyncio.Queue, latencies: List[float], statuses: Counter):
+    while True:
+        try:
+            email = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        started = time.perf_counter()
+        response = await client.post("/auth/login_or_register", json={"email": email, "password": "benchmark-pass"})
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] += 1
+
+
+async def _feed_worker(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/posts/", params={"limit": 10})
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(base_url: str, logins: int, concurrency: int, readers: int) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    # Each address is used twice: once to register, once to log in
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(logins // 2)]
+    queue: asyncio.Queue = asyncio.Queue()
+    for email in emails + emails:
+        queue.put_nowait(email)
+
+    login_latencies: List[float] = []
+    feed_latencies: List[float] = []
+    statuses: Counter = Counter()
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=concurrency + readers)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        readers_tasks = [asyncio.create_task(_feed_worker(client, stop, feed_latencies)) for _ in range(readers)]
+        started = time.perf_counter()
+        await asyncio.gather(*[_login_worker(client, queue, login_latencies, statuses) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*readers_tasks)
+
+    return {
+        "logins": percentiles(login_latencies),
+        "logins_per_second": round(len(login_latencies) / elapsed, 1),
+        "status_codes": dict(statuses),
+        "feed_during_logins": percentiles(feed_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=10, help="concurrent feed readers during the run")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.base_url, args.logins, args.concurrency, args.readers)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Latency and throughput of the hot endpoints against a seeded database.
+
+Each scenario runs --concurrency clients for --duration seconds (after
+--warmup seconds that are not measured) and reports p50/p95/p99 latency,
+requests per second and status codes. Post ids are drawn from 1..--posts
+with --seed, so a run against a database from benchmarks.seed is
+repeatable. By default requests go to a live server at --base-url; --app
+drives app.main in-process through httpx's ASGI transport instead (no
+startup events, so the view buffer is never flushed).
+
+    python -m benchmarks.scenarios --posts 50000 --save-baseline baseline.json
+    python -m benchmarks.scenarios --posts 50000 --baseline baseline.json
+
+With --baseline the exit status is 1 when any metric is worse than the
+baseline by more than --tolerance. After the like scenarios (like_hot has
+every client toggling likes on --hot-post at once) the database at
+DATABASE_URL is checked: the exit status is also 1 when any post's
+like_count differs from its number of rows in `likes`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from sqlalchemy import func, select
+
+from benchmarks.baseline import compare, format_comparison, load_baseline, save_baseline
+from benchmarks import PASSWORD
+from benchmarks.stats import percentiles
+
+Request = Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+
+
+def _scenarios(args, tokens: List[str]) -> Dict[str, Request]:
+    def post_id(rng: random.Random) -> int:
+        return rng.randint(1, args.posts)
+
+    async def feed(client, rng):
+        return await client.get("/posts/", params={"limit": 10})
+
+    async def post(client, rng):
+        return await client.get(f"/posts/{post_id(rng)}")
+
+    async def like(client, rng):
+        headers = {"Authorization": f"Bearer {rng.choice(tokens)}"}
+        return await client.post(f"/posts/{post_id(rng)}/like", headers=headers)
+
+    async def like_hot(client, rng):
+        headers = {"Authorization": f"Bearer {rng.choice(tokens)}"}
+        return await client.post(f"/posts/{args.hot_post}/like", headers=headers)
+
+    async def comments(client, rng):
+        return await client.get(f"/comments/{post_id(rng)}", params={"limit": 5})
+
+    return {"feed": feed, "post": post, "like": like, "like_hot": like_hot, "comments": comments}
+
+
+async def _login(client: httpx.AsyncClient, users: int) -> List[str]:
+    tokens = []
+    for i in range(1, users + 1):
+        response = await client.post(
+            "/auth/login_or_register", json={"email": f"user{i}@bench.example", "password": PASSWORD}
+        )
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+
+async def _run_scenario(client: httpx.AsyncClient, request: Request, args, seed: int) -> dict:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    errors = 0
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + args.warmup
+    stop_at = measure_from + args.duration
+
+    async def worker(rng: random.Random):
+        nonlocal errors
+        while loop.time() < stop_at:
+            started = time.perf_counter()
+            try:
+                response = await request(client, rng)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            if loop.time() >= measure_from:
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] += 1
+
+    await asyncio.gather(*[worker(random.Random(seed * 1000 + i)) for i in range(args.concurrency)])
+    report = percentiles(latencies)
+    report["rps"] = round(len(latencies) / args.duration, 1)
+    report["status_codes"] = {str(code): n for code, n in sorted(statuses.items())}
+    report["errors"] = errors
+    return report
+
+
+def check_like_counts() -> List[dict]:
+    """Posts whose like_count disagrees with their rows in `likes`."""
+    from app.db.database import SessionLocal
+    from app.models.like import Like
+    from app.models.post import Post
+
+    likes = select(Like.post_id, func.count().label("likes")).group_by(Like.post_id).subquery()
+    stmt = (
+        select(Post.id, func.coalesce(Post.like_count, 0), func.coalesce(likes.c.likes, 0))
+        .outerjoin(likes, likes.c.post_id == Post.id)
+        .where(func.coalesce(Post.like_count, 0) != func.coalesce(likes.c.likes, 0))
+        .order_by(Post.id)
+    )
+    with SessionLocal() as db:
+        return [{"post_id": post_id, "like_count": count, "likes": rows} for post_id, count, rows in db.execute(stmt)]
+
+
+def _metadata(args) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "target": "in-process" if args.app else args.base_url,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "posts": args.posts,
+        "seed": args.seed,
+    }
+
+
+async def run(args) -> dict:
+    if args.app:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+    else:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60)
+    async with client:
+        liking = {"like", "like_hot"} & set(args.scenarios)
+        tokens = await _login(client, args.login_users) if liking else []
+        scenarios = _scenarios(args, tokens)
+        results = {}
+        for index, name in enumerate(args.scenarios):
+            results[name] = await _run_scenario(client, scenarios[name], args, args.seed + index)
+            print(f"{name}: {json.dumps(results[name])}", file=sys.stderr)
+    report = {"meta": _metadata(args), "scenarios": results}
+    if liking:
+        report["like_count_mismatches"] = check_like_counts()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--app", action="store_true", help="run app.main in-process instead of over the network")
+    parser.add_argument("--scenarios", nargs="+", default=["feed", "post", "like", "like_hot", "comments"],
+                        choices=["feed", "post", "like", "like_hot", "comments"])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--posts", type=int, default=50_000, help="post ids are drawn from 1..N")
+    parser.add_argument("--login-users", type=int, default=20, help="seeded users that take turns liking")
+    parser.add_argument("--hot-post", type=int, default=1, help="post every like_hot client toggles")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-baseline", metavar="PATH", help="write this run's report as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before a metric regresses")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    failed = False
+    for mismatch in report.get("like_count_mismatches", []):
+        print(f"FAIL post {mismatch['post_id']}: like_count {mismatch['like_count']} != {mismatch['likes']} likes")
+        failed = True
+    if args.save_baseline:
+        save_baseline(args.save_baseline, report)
+    if args.baseline:
+        rows, regressed = compare(load_baseline(args.baseline), report, args.tolerance)
+        print(format_comparison(rows))
+        failed = failed or regressed
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Bulk-load a benchmark dataset into the configured database with COPY.
+
+Rows are generated on the fly from --seed and streamed straight into
+COPY ... FROM STDIN, so millions of rows never sit in memory or on disk.
+Tables must be empty so ids come out as 1..N (the scenarios rely on
+that); --reset truncates every app table first.
+
+    python -m benchmarks.seed --reset --users 50000 --posts 200000 \\
+        --comments 2000000 --likes 5000000 --views 10000000
+
+Every seeded user can log in as user<N>@bench.example / benchmark-pass.
+Afterwards the denormalized counters and trending scores are rebuilt and
+the tables are ANALYZEd, as they would be on a live database.
+"""
+import argparse
+import io
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Sequence
+
+from sqlalchemy import text
+
+from app.utils.security import get_password_hash
+from benchmarks import PASSWORD
+from app.crud.counter_crud import rebuild_counters
+from app.crud.trending_crud import refresh_trending
+from app.db.database import SessionLocal, engine
+
+SCHEMA = "boom_blog"
+TABLES = ("users", "posts", "comments", "likes", "views", "post_scores", "images", "counters")
+
+# Enough distinct words for search and TOAST behaviour to look like real posts
+WORDS = (
+    "python fastapi postgres index query latency cache replica cursor page thread reply like view "
+    "image upload storage async worker pool connection transaction vacuum analyze planner join "
+    "window partition trigger search ranking trending score gravity decay feed author comment "
+    "garden travel coffee music football recipe winter summer mountain river city market story "
+    "design review release deploy rollback metric trace profile benchmark baseline regression"
+).split()
+
+
+class CopyStream(io.TextIOBase):
+    """Read-only file over generated rows in COPY text format."""
+
+    def __init__(self, rows: Iterator[Sequence]):
+        self._rows = rows
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = "\t".join(_copy_value(value) for value in row) + "\n"
+            parts.append(line)
+            length += len(line)
+        data = "".join(parts)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def _allocate(rng: random.Random, total: int, weights: List[float], cap: int) -> List[int]:
+    """Split `total` rows across posts by popularity, at most `cap` per post."""
+    scale = total / sum(weights)
+    return [min(cap, int(weight * scale + rng.random())) for weight in weights]
+
+
+class _Counted:
+    def __init__(self, rows: Iterator[Sequence]):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def _copy(cursor, table: str, columns: Sequence[str], rows: Iterator[Sequence]) -> None:
+    started = time.perf_counter()
+    counted = _Counted(rows)
+    cursor.copy_expert(f"COPY {SCHEMA}.{table} ({', '.join(columns)}) FROM STDIN", CopyStream(iter(counted)))
+    elapsed = time.perf_counter() - started
+    print(f"{table}: {counted.count} rows in {elapsed:.1f}s ({counted.count / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def seed(args) -> None:
+    rng = random.Random(args.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    start = now - timedelta(days=args.days)
+    step = timedelta(days=args.days) / max(args.posts, 1)
+
+    # Post popularity is heavy-tailed, like real traffic
+    weights = [rng.paretovariate(1.2) for _ in range(args.posts)]
+    likes = _allocate(rng, args.likes, weights, args.users)
+    views = [max(n, v) for n, v in zip(likes, _allocate(rng, args.views, weights, args.users))]
+    comments = _allocate(rng, args.comments, weights, args.comments)
+    created = [start + step * i for i in range(args.posts)]
+    password_hash = get_password_hash(PASSWORD)
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if args.reset:
+            cursor.execute(f"TRUNCATE {', '.join(f'{SCHEMA}.{t}' for t in TABLES)} RESTART IDENTITY CASCADE")
+        else:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {SCHEMA}.users)")
+            if cursor.fetchone()[0]:
+                raise SystemExit("Tables are not empty; pass --reset to truncate them first.")
+
+        _copy(cursor, "users", ("username", "email", "hashed_password", "is_active", "is_admin"), (
+            (f"user{i}", f"user{i}@bench.example", password_hash, True, i == 1)
+            for i in range(1, args.users + 1)
+        ))
+        _copy(cursor, "posts", (
+            "title", "content", "created_at", "updated_at", "author_id", "is_active",
+            "like_count", "view_count", "comment_count",
+        ), (
+            (
+                _sentence(rng, rng.randint(3, 8)),
+                _sentence(rng, rng.randint(40, 400)),
+                created[i], created[i], rng.randint(1, args.users),
+                rng.random() >= args.inactive_ratio,
+                likes[i], views[i], 0,
+            )
+            for i in range(args.posts)
+        ))
+        _copy(cursor, "comments", (
+            "content", "created_at", "is_approved", "post_id", "user_id",
+            "parent_id", "root_id", "depth", "path", "reply_count",
+        ), _comment_rows(rng, args, comments, created, now))
+        _copy(cursor, "likes", ("user_id", "post_id"), _pair_rows(rng, args.users, likes))
+        _copy(cursor, "views", ("user_id", "post_id"), _pair_rows(rng, args.users, views))
+        raw.commit()
+    finally:
+        raw.close()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rebuild_counters(db)
+        print(f"counters rebuilt in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+    started = time.perf_counter()
+    scored = refresh_trending(engine)
+    print(f"trending scores for {scored} posts in {time.perf_counter() - started:.1f}s")
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+
+
+def _comment_rows(rng: random.Random, args, counts: List[int], created: List[datetime], now: datetime):
+    comment_id = 0
+    for index, count in enumerate(counts):
+        post_id = index + 1
+        span = (now - created[index]).total_seconds()
+        roots: List[tuple] = []
+        for offset in sorted(rng.random() * span for _ in range(count)):
+            comment_id += 1
+            segment = format(comment_id, "010d")
+            if roots and rng.random() < args.reply_ratio:
+                root_id, root_path = rng.choice(roots)
+                parent = (root_id, root_id, 1, f"{root_path}/{segment}")
+            else:
+                roots.append((comment_id, segment))
+                parent = (None, None, 0, segment)
+            yield (
+                _sentence(rng, rng.randint(5, 40)),
+                created[index] + timedelta(seconds=offset),
+                rng.random() >= args.unapproved_ratio,
+                post_id,
+                rng.randint(1, args.users),
+                *parent,
+                0,
+            )
+
+
+def _pair_rows(rng: random.Random, users: int, counts: List[int]):
+    population = range(1, users + 1)
+    for index, count in enumerate(counts):
+        for user_id in rng.sample(population, count):
+            yield user_id, index + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reset", action="store_true", help="truncate all app tables first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--posts", type=int, default=50_000)
+    parser.add_argument("--comments", type=int, default=500_000)
+    parser.add_argument("--likes", type=int, default=1_000_000)
+    parser.add_argument("--views", type=int, default=2_000_000)
+    parser.add_argument("--days", type=int, default=60, help="posts are spread over this many days up to now")
+    parser.add_argument("--reply-ratio", type=float, default=0.3)
+    parser.add_argument("--unapproved-ratio", type=float, default=0.02)
+    parser.add_argument("--inactive-ratio", type=float, default=0.02)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    seed(args)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
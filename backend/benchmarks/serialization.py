@@ -0,0 +1,92 @@
+"""
+Microbenchmark: serializing a page of 100 PostResponse objects.
+
+Compares the path FastAPI takes for a route that returns ORM objects with
+a response_model (validate, dump to Python, then json.dumps or orjson) with
+the single-pass ResponseSerializer the list routes use. Runs offline on
+in-memory ORM objects, no database needed.
+
+    python -m benchmarks.serialization --posts 100 --repeat 2000
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.api.routes.posts import PaginatedPostsResponse
+from app.models.post import Post
+from app.models.user import User
+from app.utils.serialization import ResponseSerializer
+
+
+def make_page(count: int) -> dict:
+    author = User(id=1, username="author", email="author@example.com", is_active=True, is_admin=False)
+    now = datetime(2026, 1, 1)
+    posts = []
+    for i in range(count):
+        post = Post(
+            id=i + 1, title=f"Post {i}", content="Lorem ipsum dolor sit amet. " * 20, author_id=1,
+            author=author, created_at=now - timedelta(minutes=i), updated_at=now, is_active=True,
+            like_count=i, view_count=i * 3, image_url=f"https://cdn.example.com/{i}.jpg", image_status="ready",
+            image_renditions={
+                "sizes": {"card": {"width": 800, "height": 450, "urls": {"webp": f"https://cdn.example.com/{i}.webp"}}},
+                "srcset": {"webp": f"https://cdn.example.com/{i}.webp 800w"},
+            },
+        )
+        post.is_liked = i % 2 == 0
+        post.is_viewed = i % 3 == 0
+        posts.append(post)
+    return {"posts": posts, "total": count * 10, "next_cursor": "cursor"}
+
+
+def _time(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    page = make_page(args.posts)
+    adapter = TypeAdapter(PaginatedPostsResponse)
+    serializer = ResponseSerializer(PaginatedPostsResponse)
+
+    def fastapi_default():
+        validated = adapter.validate_python(page, from_attributes=True)
+        return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+    def fastapi_orjson():
+        validated = adapter.validate_python(page, from_attributes=True)
+        return orjson.dumps(adapter.dump_python(validated, mode="json"))
+
+    cases = {
+        "validate + dump_python + json.dumps (FastAPI default)": fastapi_default,
+        "validate + dump_python + orjson (ORJSONResponse)": fastapi_orjson,
+        "ResponseSerializer (validate + dump_json)": lambda: serializer.to_json(page),
+    }
+    # The three must agree before their timings mean anything
+    outputs = {name: json.loads(fn()) for name, fn in cases.items()}
+    assert all(output == next(iter(outputs.values())) for output in outputs.values())
+
+    baseline = None
+    for name, fn in cases.items():
+        _time(fn, max(args.repeat // 10, 1))  # warm up
+        median = statistics.median(_time(fn, args.repeat)) * 1e6
+        baseline = baseline or median
+        print(f"{median:9.1f} us  x{baseline / median:4.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
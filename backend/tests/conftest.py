@@ -0,0 +1,80 @@
+"""
+The app against two SQLite files, a primary and one read replica, so the
+routing, query-count and search tests run without Postgres. Set
+TEST_DATABASE_URL to a throwaway Postgres database (its tables are emptied
+after every test) to make it the primary and also run the Postgres-only
+tests, such as the like contention test.
+"""
+import os
+import tempfile
+
+_data_dir = tempfile.mkdtemp(prefix="boom-blog-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{_data_dir}/primary.db"
+os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{_data_dir}/replica.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["RESPONSE_CACHE_MAXSIZE"] = "0"  # every request reaches the database
+os.environ["METRICS_ENABLED"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import models  # noqa: F401  registers every table on Base.metadata
+from app.db.database import Base, engines
+from app.db import routing
+from app.main import app
+from app.models.post import Post
+from app.models.user import User
+from app.utils.principal_cache import principal_cache
+from app.utils.security import create_access_token
+
+PRIMARY = engines["primary"]
+REPLICA = engines["replica_0"]
+
+if PRIMARY.dialect.name == "postgresql":
+    with PRIMARY.begin() as _conn:
+        _conn.execute(text("CREATE SCHEMA IF NOT EXISTS boom_blog"))
+for _engine in (PRIMARY, REPLICA):
+    Base.metadata.create_all(_engine)
+
+postgres_only = pytest.mark.skipif(
+    PRIMARY.dialect.name != "postgresql", reason="needs TEST_DATABASE_URL pointing at Postgres"
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    yield
+    for engine in (PRIMARY, REPLICA):
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+    routing._recent_writers.clear()
+    principal_cache.clear()
+
+
+@pytest.fixture
+def client():
+    # No `with`: the lifespan (background loops, storage checks) stays off
+    return TestClient(app)
+
+
+def make_user(engine, username: str = "author") -> User:
+    with Session(engine, expire_on_commit=False) as db:
+        user = User(username=username, email=f"{username}@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+        return user
+
+
+def make_post(engine, author: User, title: str = "Post") -> Post:
+    with Session(engine, expire_on_commit=False) as db:
+        post = Post(title=title, content="Body", author_id=author.id, is_active=True)
+        db.add(post)
+        db.commit()
+        return post
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Session
+
+from app.crud.counter_crud import ACTIVE_POSTS, POSTS, USERS, get_counter, increment_counter, seed_counters
+from app.db.query_counter import QueryCounter
+from conftest import PRIMARY, make_post, make_user
+
+
+def test_seeded_counters_are_kept_and_read_without_counting():
+    make_post(PRIMARY, make_user(PRIMARY))
+    with Session(PRIMARY) as db:
+        assert set(seed_counters(db)) >= {USERS, POSTS, ACTIVE_POSTS}
+        assert seed_counters(db) == []  # already there: left alone
+
+        increment_counter(db, POSTS)
+        db.commit()
+        with QueryCounter(PRIMARY) as counter:
+            assert get_counter(db, POSTS) == 2
+        assert counter.count == 1  # the counter row only, no COUNT(*) fallback
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.post import Post
+from app.utils.image_pipeline import FAILED, PENDING, ImageUploader
+from conftest import PRIMARY, make_post, make_user
+
+SHA256 = "ab" * 32
+
+
+@pytest.fixture
+def staging(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_STAGING_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def uploader(monkeypatch):
+    uploader = ImageUploader(workers=1, max_attempts=1, retry_seconds=0)
+    queued = []
+    monkeypatch.setattr(uploader._executor, "submit", lambda fn, *args: queued.append(args))
+    uploader.queued = queued
+    return uploader
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", ""])
+    process.wait()
+    return process.pid
+
+
+def test_resume_leaves_files_of_live_workers_alone(staging, uploader):
+    live = staging / f"1_{SHA256}_aa_{os.getppid()}.jpg"
+    dead = staging / f"2_{SHA256}_bb_{dead_pid()}.jpg"
+    legacy = staging / f"3_{SHA256}_cc.jpg"
+    for path in (live, dead, legacy):
+        path.write_bytes(b"x")
+
+    assert uploader.resume() == 2
+    assert live.exists()  # still owned by its worker
+    claimed = sorted(name for name in os.listdir(staging) if name.endswith(f"_{os.getpid()}.jpg"))
+    assert claimed == [f"2_{SHA256}_bb_{os.getpid()}.jpg", f"3_{SHA256}_cc_{os.getpid()}.jpg"]
+    assert sorted(post_id for post_id, _, _ in uploader.queued) == [2, 3]
+
+
+def test_failed_attach_marks_the_post_and_drops_the_file(staging, uploader, monkeypatch):
+    post = make_post(PRIMARY, make_user(PRIMARY))
+    staged = staging / "staged_aa.jpg"
+    staged.write_bytes(b"x")
+
+    def shut_down(fn, *args):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+    monkeypatch.setattr(uploader._executor, "submit", shut_down)
+    with Session(PRIMARY, expire_on_commit=False) as db:
+        db_post = db.get(Post, post.id)
+        db_post.image_status = PENDING
+        db.commit()
+        with pytest.raises(RuntimeError):
+            uploader.attach(db, db_post, str(staged), SHA256)
+
+    assert os.listdir(staging) == []
+    assert post.id not in uploader._latest
+    with Session(PRIMARY) as db:
+        assert db.get(Post, post.id).image_status == FAILED
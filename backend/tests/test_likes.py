@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.crud.post_crud import toggle_like
+from app.models.like import Like
+from app.models.post import Post
+from conftest import PRIMARY, make_post, make_user, postgres_only
+
+USERS = 8
+TOGGLES_PER_USER = 25
+
+
+@postgres_only
+def test_concurrent_toggles_keep_like_count_in_step_with_likes():
+    users = [make_user(PRIMARY, f"liker{i}") for i in range(USERS)]
+    post = make_post(PRIMARY, users[0])
+
+    def toggle_many(user_id: int, times: int) -> None:
+        for _ in range(times):
+            with Session(PRIMARY) as db:
+                toggle_like(db, post.id, user_id)
+
+    # Two threads per user, so the same (post, user) row is also contended;
+    # odd totals per user leave a mix of liked and unliked users behind
+    with ThreadPoolExecutor(max_workers=USERS * 2) as executor:
+        futures = [
+            executor.submit(toggle_many, user.id, TOGGLES_PER_USER + (i % 2))
+            for i, user in enumerate(users)
+            for _ in range(2)
+        ]
+        for future in futures:
+            future.result()
+
+    with Session(PRIMARY) as db:
+        like_count = db.scalar(select(Post.like_count).where(Post.id == post.id))
+        likes = db.scalar(select(func.count()).select_from(Like).where(Like.post_id == post.id))
+    assert like_count == likes
@@ -0,0 +1,30 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.metrics import MetricsMiddleware
+
+
+def _client(token):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, token=token)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    return TestClient(app)
+
+
+def test_metrics_need_the_token():
+    client = _client("s3cret")
+    client.get("/items/1")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"}' in response.text
+
+
+def test_metrics_not_served_without_a_token():
+    assert _client(None).get("/metrics").status_code == 404
@@ -0,0 +1,9 @@
+def test_feed_page_size_is_capped(client):
+    assert client.get("/posts/", params={"limit": 101}).status_code == 422
+    assert client.get("/posts/", params={"limit": 0}).status_code == 422
+    assert client.get("/posts/", params={"skip": -1}).status_code == 422
+
+
+def test_comment_page_size_is_capped(client):
+    assert client.get("/comments/1", params={"limit": 101}).status_code == 422
+    assert client.get("/comments/1", params={"skip": -1}).status_code == 422
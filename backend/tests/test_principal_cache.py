@@ -0,0 +1,37 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db import routing
+from app.models.user import User
+from app.utils.principal_cache import cache_principal, get_cached_principal
+from conftest import PRIMARY, auth_headers, make_post, make_user
+
+
+def _block_elsewhere(user: User) -> None:
+    # As another worker would: the row changes, this process's cache does not
+    with Session(PRIMARY) as db:
+        db.execute(update(User).where(User.id == user.id).values(is_active=False))
+        db.commit()
+
+
+def test_blocked_user_cannot_write_with_a_stale_cached_principal(client):
+    author = make_user(PRIMARY)
+    post = make_post(PRIMARY, author)
+    cache_principal(author)
+    _block_elsewhere(author)
+
+    response = client.put(f"/posts/{post.id}", data={"title": "Changed"}, headers=auth_headers(author))
+    assert response.status_code == 403
+    assert get_cached_principal(author.id).is_active is False
+
+
+def test_reads_use_the_cached_principal(client, monkeypatch):
+    monkeypatch.setattr(routing, "_next_replica", None)
+    author = make_user(PRIMARY)
+    post = make_post(PRIMARY, author)
+    cache_principal(author)
+    _block_elsewhere(author)
+
+    # Within the TTL a plain read still sees the cached, active principal
+    assert client.get(f"/posts/{post.id}", headers=auth_headers(author)).status_code == 200
+    assert get_cached_principal(author.id).is_active is True
@@ -0,0 +1,64 @@
+"""
+Pin the number of SQL statements of the hot read endpoints, so an N+1
+(one extra SELECT per row) fails here instead of in production. Each
+endpoint is measured with several authors so a per-row lazy load shows.
+"""
+import pytest
+from sqlalchemy.orm import Session
+
+from app.crud.comment_crud import create_comment
+from app.crud.counter_crud import rebuild_counters
+from app.db import routing
+from app.db.database import async_engine
+from app.db.query_counter import assert_num_queries
+from app.schemas.comment_schema import CommentCreate
+from conftest import PRIMARY, make_post, make_user
+
+AUTHORS = 3
+
+
+@pytest.fixture(autouse=True)
+def read_from_primary(monkeypatch):
+    # Keep every read on the engine being counted
+    monkeypatch.setattr(routing, "_next_replica", None)
+
+
+@pytest.fixture
+def post_with_threads():
+    users = [make_user(PRIMARY, f"user{i}") for i in range(AUTHORS)]
+    posts = [make_post(PRIMARY, user, f"Post {i}") for i, user in enumerate(users)]
+    post = posts[0]
+    with Session(PRIMARY) as db:
+        for user in users:
+            root = create_comment(db, CommentCreate(content="Root"), user.id, post.id)
+            for replier in users:
+                create_comment(db, CommentCreate(content="Reply", parent_id=root.id), replier.id, post.id)
+        rebuild_counters(db)  # as the migrations and benchmarks.seed leave them
+    return post
+
+
+def test_feed(client, post_with_threads):
+    with assert_num_queries(async_engine.sync_engine, 2):
+        response = client.get("/posts/", params={"limit": 10})
+    assert len(response.json()["posts"]) == AUTHORS
+
+
+def test_feed_by_cursor(client, post_with_threads):
+    cursor = client.get("/posts/", params={"limit": 1}).json()["next_cursor"]
+    with assert_num_queries(async_engine.sync_engine, 2):
+        response = client.get("/posts/", params={"limit": 10, "cursor": cursor})
+    assert len(response.json()["posts"]) == AUTHORS - 1
+
+
+def test_post_detail(client, post_with_threads):
+    with assert_num_queries(async_engine.sync_engine, 1):
+        response = client.get(f"/posts/{post_with_threads.id}")
+    assert response.json()["author"]["username"] == "user0"
+
+
+def test_comments_with_replies(client, post_with_threads):
+    with assert_num_queries(async_engine.sync_engine, 2):
+        response = client.get(f"/comments/{post_with_threads.id}", params={"limit": 10, "replies": 3})
+    comments = response.json()["comments"]
+    assert len(comments) == AUTHORS
+    assert all(len(comment["replies"]) == AUTHORS for comment in comments)
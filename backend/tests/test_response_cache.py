@@ -0,0 +1,28 @@
+import pytest
+
+from app.api.routes import comments
+from app.db import routing
+from app.utils.ttl_cache import TTLCache
+from conftest import PRIMARY, auth_headers, make_post, make_user
+
+
+@pytest.fixture
+def other_workers_cache(monkeypatch):
+    # Comment writes invalidate app.utils.response_cache, not this one: like
+    # the cache of a worker that did not handle the write
+    monkeypatch.setattr(routing, "_next_replica", None)
+    monkeypatch.setattr(comments, "response_cache", TTLCache(maxsize=16, ttl=60))
+
+
+def test_comment_author_bypasses_a_stale_cached_page(client, other_workers_cache):
+    author = make_user(PRIMARY)
+    post = make_post(PRIMARY, author)
+    assert client.get(f"/comments/{post.id}").json()["total"] == 0  # cached
+
+    response = client.post(f"/comments/{post.id}", json={"content": "First"}, headers=auth_headers(author))
+    assert response.status_code == 201
+
+    assert client.get(f"/comments/{post.id}", headers=auth_headers(author)).json()["total"] == 1
+    # Anonymous readers may lag until the entry expires
+    client.cookies.clear()
+    assert client.get(f"/comments/{post.id}").json()["total"] == 0
@@ -0,0 +1,48 @@
+import time
+
+from app.core.config import settings
+from app.db import routing
+from conftest import PRIMARY, auth_headers, make_post, make_user
+
+
+def test_anonymous_reads_go_to_the_replica(client):
+    post = make_post(PRIMARY, make_user(PRIMARY))
+    # Not replicated yet, so only the primary has it
+    assert client.get(f"/posts/{post.id}").status_code == 404
+
+
+def test_writer_reads_own_write_from_the_primary(client):
+    author = make_user(PRIMARY)
+    post = make_post(PRIMARY, author)
+    response = client.post(f"/comments/{post.id}", json={"content": "First"}, headers=auth_headers(author))
+    assert response.status_code == 201
+    assert routing.READ_YOUR_WRITES_COOKIE in response.cookies
+
+    assert client.get(f"/posts/{post.id}", headers=auth_headers(author)).status_code == 200
+
+
+def test_cookie_pins_reads_on_a_worker_that_missed_the_write(client):
+    author = make_user(PRIMARY)
+    post = make_post(PRIMARY, author)
+    client.post(f"/comments/{post.id}", json={"content": "First"}, headers=auth_headers(author))
+    # Another worker never saw mark_write; only the cookie comes along
+    routing._recent_writers.clear()
+
+    assert client.get(f"/posts/{post.id}").status_code == 200
+
+
+def test_expired_or_forged_cookie_is_ignored(client):
+    post = make_post(PRIMARY, make_user(PRIMARY))
+    now = int(time.time())
+    for until in (now - 1, now + settings.READ_YOUR_WRITES_SECONDS * 100):
+        client.cookies.set(routing.READ_YOUR_WRITES_COOKIE, str(until))
+        assert client.get(f"/posts/{post.id}").status_code == 404
+
+
+def test_expired_writers_are_pruned(monkeypatch):
+    routing.mark_write(1)
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0)
+    clock = time.monotonic()
+    monkeypatch.setattr(routing.time, "monotonic", lambda: clock + 60)
+    routing.mark_write(2)
+    assert list(routing._recent_writers) == [2]
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db import routing
+from app.models.post import Post
+from conftest import PRIMARY, make_user
+
+
+@pytest.fixture(autouse=True)
+def read_from_primary(monkeypatch):
+    monkeypatch.setattr(routing, "_next_replica", None)
+
+
+@pytest.fixture
+def author():
+    return make_user(PRIMARY)
+
+
+def add_post(author, title: str, content: str, is_active: bool = True) -> int:
+    with Session(PRIMARY) as db:
+        post = Post(title=title, content=content, author_id=author.id, is_active=is_active)
+        db.add(post)
+        db.commit()
+        return post.id
+
+
+def search(client, q: str, **params) -> dict:
+    response = client.get("/posts/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_best_match_comes_first(client, author):
+    passing = add_post(author, "Gardening notes", "Tomatoes need sun. Also some compost.")
+    focused = add_post(author, "Compost", "Compost, compost and more compost for the compost heap.")
+
+    results = search(client, "compost")["results"]
+    assert [post["id"] for post in results] == [focused, passing]
+    assert results[0]["rank"] > results[1]["rank"]
+
+
+def test_matches_are_marked_and_user_content_is_escaped(client, author):
+    add_post(author, "<b>Bold</b> compost", "Mix <script>alert(1)</script> into the compost & wait.")
+
+    result = search(client, "compost")["results"][0]
+    assert result["title_highlight"] == "&lt;b&gt;Bold&lt;/b&gt; <mark>compost</mark>"
+    assert "<mark>compost</mark>" in result["snippet"]
+    assert "&lt;script&gt;" in result["snippet"] and "<script>" not in result["snippet"]
+    assert "&amp;" in result["snippet"]
+
+
+def test_inactive_posts_are_hidden(client, author):
+    visible = add_post(author, "Compost", "Visible compost")
+    add_post(author, "Compost", "Hidden compost", is_active=False)
+
+    assert [post["id"] for post in search(client, "compost")["results"]] == [visible]
+
+
+def test_query_syntax_is_treated_as_text(client, author):
+    add_post(author, "Compost", "Plain compost")
+    # FTS5/tsquery operators in user input must not raise
+    assert search(client, 'compost" OR NEAR(')["results"] == []
+
+
+def test_cursor_pages_do_not_repeat_or_skip(client, author):
+    # Identical posts tie on rank, so the id tiebreak decides the order
+    ids = {add_post(author, "Compost", "All about compost") for _ in range(5)}
+
+    first = search(client, "compost", limit=3)
+    assert first["next_cursor"]
+    second = search(client, "compost", limit=3, cursor=first["next_cursor"])
+    assert second["next_cursor"] is None
+
+    seen = [post["id"] for post in first["results"] + second["results"]]
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == ids